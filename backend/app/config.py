@@ -1,5 +1,5 @@
 # app/config.py
+import os
 import pathlib
 BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
-UPLOAD_DIR = BASE_DIR / "uploaded_files"
-UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_DIR = pathlib.Path(os.getenv("UPLOAD_DIR", BASE_DIR / "uploaded_files"))
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./database.db"
 
@@ -9,3 +10,26 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+
+def upgrade_schema() -> None:
+    """
+    Bring an existing database in line with the models.
+
+    ``create_all`` only creates missing tables, so columns and indexes that
+    were added to existing models later are applied here.  Only additive
+    changes are supported – new columns must be nullable or carry a
+    ``server_default``.
+    """
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name not in existing:
+                    ddl = CreateColumn(col).compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+            for idx in table.indexes:
+                idx.create(conn, checkfirst=True)
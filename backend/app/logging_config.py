@@ -1,13 +1,14 @@
 # backend/app/logging_config.py
 import logging
+import os
 from logging.config import dictConfig
 from pathlib import Path
 
-LOG_DIR  = Path(__file__).resolve().parent.parent / "logs"
-LOG_DIR.mkdir(exist_ok=True)
+LOG_DIR  = Path(os.getenv("LOG_DIR", Path(__file__).resolve().parent.parent / "logs"))
 LOG_FILE = LOG_DIR / "app.log"
 
 def setup_logging():
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
     dictConfig(
         {
             "version": 1,
@@ -32,6 +33,11 @@ def setup_logging():
                     "level": "DEBUG",
                 },
             },
+            "loggers": {
+                # one "Added job"/"Removed job" line per reminder makes bulk
+                # imports log-bound; job runs are still logged by the executor
+                "apscheduler.scheduler": {"level": "WARNING"},
+            },
             "root": {
                 "handlers": ["console", "file"],
                 "level": "DEBUG",
@@ -1,74 +1,182 @@
+"""
+PlanPago API – App-Factory.
+
+Der Import ist frei von Nebenwirkungen: ``create_app()`` baut nur die App
+(Middleware, Router).  DB-Schema, Admin-Seed, Logging und Scheduler laufen
+im Lifespan beim Start des Servers – ``uvicorn app.main:app`` bzw. ein
+``with TestClient(app)`` lösen ihn aus.  Schwere optionale Module
+(reportlab, pyotp, crypto) importieren die Routen erst beim ersten Aufruf.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+import os
+
 from fastapi import FastAPI
+from sqlalchemy import func, update
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-import os
-
-from passlib.context import CryptContext
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.memory import MemoryJobStore
 
 from .config import UPLOAD_DIR
-from .database import Base, engine, SessionLocal
+from .database import Base, engine, SessionLocal, upgrade_schema
 from . import models
-from .routes import users, contracts, contract_files, logs          # NEW
-from .utils.email_utils import schedule_all_reminders
-from .logging_config import setup_logging                           # NEW
-
-# ────────────── Basics & Logging ─────────────────────────────────
-load_dotenv()                 # lädt .env (+ .env.development bei Bedarf)
-setup_logging()               # file- & console-Logger aktivieren
-
-# ────────────── DB-Schema & Admin-Seed ───────────────────────────
-Base.metadata.create_all(bind=engine)
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-db = SessionLocal()
-if not db.query(models.User).filter(models.User.email == "admin@admin").first():
-    db.add(
-        models.User(
-            email="admin@admin",
-            hashed_password=pwd_context.hash("admin"),
-            is_admin=True,
+from .routes import users, contracts, contract_files, logs, health, events
+from .utils import health as health_probes
+from .utils import leader, stats
+from .utils.email_utils import send_reminder_digests
+from .utils.maintenance import roll_forward_due_dates, expire_contracts, prune_tombstones
+from .logging_config import setup_logging
+
+_bootstrapped = False
+
+
+# ────────────── DB-Schema & Admin-Seed (einmal pro Prozess) ──────
+def bootstrap() -> None:
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    UPLOAD_DIR.mkdir(exist_ok=True)
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+    with engine.begin() as conn:           # accounts from before User.cache_epoch
+        conn.execute(
+            update(models.User).where(models.User.cache_epoch.is_(None))
+            .values(cache_epoch=func.lower(func.hex(func.randomblob(6))))
         )
+
+    db = SessionLocal()
+    try:
+        if not db.query(models.User.id).filter(models.User.email == "admin@admin").first():
+            db.add(
+                models.User(
+                    email="admin@admin",
+                    hashed_password=users._hash("admin"),
+                    is_admin=True,
+                )
+            )
+            db.commit()
+    finally:
+        db.close()
+    _bootstrapped = True
+
+
+# ────────────── Scheduler (Reminder-Jobs) ────────────────────────
+def start_scheduler() -> BackgroundScheduler:
+    jobstores = {"default": MemoryJobStore()}
+    scheduler = BackgroundScheduler(jobstores=jobstores, timezone="Europe/Berlin")
+    scheduler.start()
+
+    # Health-Probes laufen im Hintergrund, /users/admin/health liest nur den Cache
+    scheduler.add_job(
+        health_probes.refresh,
+        trigger="interval",
+        seconds=health_probes.HEALTH_INTERVAL,
+        id="health_probes",
+        args=[scheduler],
+        next_run_time=datetime.now(scheduler.timezone),
+        replace_existing=True,
+    )
+
+    # Alles Weitere läuft nur im Leader-Prozess (utils/leader.py): bei mehreren
+    # Workern plant genau einer Reminder & Wartung, die anderen leiten weiter.
+    # Reminder aller Verträge plant der Leader beim Übernehmen selbst.
+
+    # Statistik-Zähler regelmäßig gegen die Tabellen abgleichen (Drift korrigieren)
+    leader.job(
+        stats.reconcile,
+        run_now=True,
+        trigger="interval",
+        hours=stats.RECONCILE_HOURS,
+        id="stats_reconcile",
+    )
+
+    # Nächste Fälligkeiten nachts fortschreiben (beim Start: fehlende Werte füllen)
+    leader.job(
+        roll_forward_due_dates,
+        run_now=True,
+        trigger="cron",
+        hour=2,
+        minute=0,
+        id="roll_forward_due_dates",
     )
-    db.commit()
-db.close()
+
+    # Abgelaufene Verträge nachts auf "expired" setzen (beim Start: nachholen)
+    leader.job(
+        expire_contracts,
+        run_now=True,
+        trigger="cron",
+        hour=2,
+        minute=15,
+        id="expire_contracts",
+    )
+
+    # Alte Delta-Sync-Tombstones nachts entfernen
+    leader.job(
+        prune_tombstones,
+        trigger="cron",
+        hour=2,
+        minute=30,
+        id="prune_tombstones",
+    )
+
+    # Tages-Digest für Nutzer mit reminder_digest (statt Einzel-Reminder)
+    leader.job(
+        send_reminder_digests,
+        trigger="cron",
+        hour=3,
+        minute=0,
+        id="reminder_digest",
+    )
+
+    leader.start(scheduler)
+    return scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()           # file- & console-Logger aktivieren
+    bootstrap()
+    app.state.scheduler = start_scheduler()
+    try:
+        yield
+    finally:
+        # Lease sofort freigeben, damit ein anderer Worker übernimmt
+        leader.release()
+        app.state.scheduler.shutdown(wait=False)
+
 
 # ────────────── FastAPI-App ──────────────────────────────────────
-app = FastAPI(
-    title="PlanPago API",
-    description="Vertragsverwaltung für Privatpersonen",
-)
-
-# ────────────── CORS ─────────────────────────────────────────────
-origins = os.getenv("CORS_ORIGINS", "").split(",")
-if not origins or origins == [""]:
-    origins = ["https://planpago.buccilab.com"]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    allow_credentials=True,
-)
+def create_app() -> FastAPI:
+    load_dotenv()             # lädt .env (+ .env.development bei Bedarf)
 
-# ────────────── Scheduler (Reminder-Jobs) ────────────────────────
-jobstores = {"default": MemoryJobStore()}
-scheduler = BackgroundScheduler(jobstores=jobstores, timezone="Europe/Berlin")
-scheduler.start()
-app.state.scheduler = scheduler
-
-@app.on_event("startup")
-def load_existing_reminders():
-    """Beim Start Reminder für alle vorhandenen Verträge neu planen."""
-    session = SessionLocal()
-    for c in session.query(models.Contract).all():
-        schedule_all_reminders(c, scheduler)
-    session.close()
-
-# ────────────── Router registrieren ──────────────────────────────
-app.include_router(users.router)
-app.include_router(contracts.router)
-app.include_router(contract_files.router)
-app.include_router(logs.router)        # NEW  →  /admin/logs
+    app = FastAPI(
+        title="PlanPago API",
+        description="Vertragsverwaltung für Privatpersonen",
+        lifespan=lifespan,
+    )
+
+    # ────────────── CORS ─────────────────────────────────────────
+    origins = os.getenv("CORS_ORIGINS", "").split(",")
+    if not origins or origins == [""]:
+        origins = ["https://planpago.buccilab.com"]
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        allow_credentials=True,
+    )
+
+    # ────────────── Router registrieren ──────────────────────────
+    app.include_router(users.router)
+    app.include_router(contracts.router)
+    app.include_router(contract_files.router)
+    app.include_router(logs.router)        # /admin/logs
+    app.include_router(health.router)      # /healthz, /readyz
+    app.include_router(events.router)      # /events/stream (SSE)
+    return app
+
+
+app = create_app()
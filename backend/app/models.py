@@ -1,8 +1,9 @@
 # backend/app/models.py
+import secrets
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Float,
-    ForeignKey, Boolean
+    Column, Integer, BigInteger, String, DateTime, Float,
+    ForeignKey, Boolean, Index
 )
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -17,9 +18,20 @@ class User(Base):
     is_admin                = Column(Boolean, default=False, nullable=False)
     last_2fa_at             = Column(DateTime, nullable=True)
     email_reminders_enabled = Column(Boolean, default=True, nullable=False)
+    # one daily digest mail instead of one mail per contract & reminder
+    reminder_digest         = Column(Boolean, default=False, server_default="0", nullable=False)
     country                 = Column(String, nullable=True)
     currency                = Column(String, nullable=True)   # ✅ lower-case & consistent
 
+    last_login_at           = Column(DateTime, nullable=True)
+    # bumped on every contract / file write → ETags (utils/versioning.py)
+    data_version            = Column(Integer, default=0, server_default="0", nullable=False)
+    # random per account: SQLite reuses the ids of deleted users, so ETags and
+    # cached pages carry this too and never match a previous owner of the id
+    cache_epoch             = Column(String, default=lambda: secrets.token_hex(6), nullable=True)
+    # tombstones up to this version were pruned → older sync cursors are void
+    sync_floor              = Column(Integer, default=0, server_default="0", nullable=False)
+
     # Login cooldown fields
     failed_login_count   = Column(Integer, default=0, nullable=False)
     login_cooldown_until = Column(DateTime, nullable=True)
@@ -48,9 +60,25 @@ class Contract(Base):
     status           = Column(String, default="active", nullable=False)  # expects: active, cancelled, expired
     notes            = Column(String, nullable=True)
 
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # derived from the schedule (utils/recurrence.derived_fields), kept current
+    # on writes and rolled forward nightly – indexed for sorting/filtering
+    next_due_date      = Column(DateTime, nullable=True)   # None: no further payment
+    monthly_equivalent = Column(Float, nullable=True)
+
+    # delta sync: owner's data_version of the last write (GET /contracts/changes)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
+    change_seq = Column(Integer, default=0, server_default="0", nullable=False)
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     user    = relationship("User", back_populates="contracts")
 
+    __table_args__ = (
+        Index("ix_contracts_user_next_due", "user_id", "next_due_date"),
+        Index("ix_contracts_user_monthly", "user_id", "monthly_equivalent"),
+        Index("ix_contracts_user_change", "user_id", "change_seq"),
+        Index("ix_contracts_status_end", "status", "end_date"),   # nightly expiry
+    )
+
     files = relationship(
         "ContractFile", back_populates="contract", cascade="all, delete-orphan"
     )
@@ -71,13 +99,36 @@ class ContractFile(Base):
     __tablename__ = "contract_files"
 
     id                = Column(Integer, primary_key=True, index=True)
-    contract_id       = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False)
+    contract_id       = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False, index=True)
     file_path         = Column(String, nullable=False)
     original_filename = Column(String, nullable=False)
     uploaded_at       = Column(DateTime, default=datetime.utcnow)
+    size_bytes        = Column(Integer, nullable=True)   # encrypted size on disk
+    updated_at        = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
+    change_seq        = Column(Integer, default=0, server_default="0", nullable=False)
 
     contract = relationship("Contract", back_populates="files")
 
+    __table_args__ = (
+        Index("ix_contract_files_contract_change", "contract_id", "change_seq"),
+    )
+
+
+class Tombstone(Base):
+    """Deleted contract / file ids, kept for delta sync (GET /contracts/changes)."""
+    __tablename__ = "tombstones"
+
+    id         = Column(Integer, primary_key=True)
+    user_id    = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind       = Column(String, nullable=False)       # "contract" | "file"
+    object_id  = Column(Integer, nullable=False)
+    change_seq = Column(Integer, nullable=False)      # owner's data_version of the delete
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_tombstones_user_change", "user_id", "change_seq"),
+    )
+
 
 class ImpersonationRequest(Base):
     __tablename__ = "impersonation_requests"
@@ -91,3 +142,29 @@ class ImpersonationRequest(Base):
 
     admin = relationship("User", foreign_keys=[admin_id])
     user = relationship("User", foreign_keys=[user_id])
+
+
+class SystemStat(Base):
+    """Incrementally maintained counters for the admin panel (see utils/stats.py)."""
+    __tablename__ = "system_stats"
+
+    key   = Column(String, primary_key=True)   # e.g. "contracts.type.rent", "mails.2025-06-01"
+    value = Column(BigInteger, default=0, nullable=False)
+
+
+class SchedulerLease(Base):
+    """Leader lease for scheduled work across worker processes (utils/leader.py)."""
+    __tablename__ = "scheduler_lease"
+
+    name       = Column(String, primary_key=True)          # "scheduler"
+    holder     = Column(String, nullable=False)            # host:pid:nonce
+    expires_at = Column(DateTime, nullable=False)
+
+
+class ReminderOutbox(Base):
+    """Contract ids whose reminder jobs the leader has to rebuild (utils/leader.py)."""
+    __tablename__ = "reminder_outbox"
+
+    id          = Column(Integer, primary_key=True)
+    contract_id = Column(Integer, nullable=False)          # no FK – deleted contracts are queued too
+    created_at  = Column(DateTime, default=datetime.utcnow, nullable=False)
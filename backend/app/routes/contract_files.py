@@ -1,12 +1,12 @@
 # backend/app/routes/contract_files.py
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Request, Response
 from fastapi.responses import JSONResponse, StreamingResponse
 from ..config import UPLOAD_DIR
 from ..models import Contract, ContractFile
 from ..database import SessionLocal
 from ..routes.users import get_current_user
-import uuid, shutil, mimetypes
-from ..utils import crypto_utils
+import uuid, mimetypes
+from ..utils import file_reaper, stats, versioning
 
 router = APIRouter(
     prefix="/contracts/{contract_id}/files",
@@ -36,6 +36,9 @@ async def upload_files(
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
 
+    seq = versioning.bump(db, [current_user.id])[current_user.id]
+    from ..utils import crypto_utils   # cryptography erst beim ersten Upload laden
+
     saved = []
     for up in files:
         # Dateiendung ermitteln (optional)
@@ -52,10 +55,14 @@ async def upload_files(
             contract_id=contract.id,
             file_path=f"/files/{uid}",
             original_filename=up.filename,
+            size_bytes=dest.stat().st_size,
+            change_seq=seq,
         )
         db.add(db_file)
         saved.append(db_file)
 
+    stats.bump(db, {"files": len(saved),
+                    "stored_bytes": sum(f.size_bytes for f in saved)})
     db.commit()
 
     # Gib zurück, was wir gerade angelegt haben
@@ -67,9 +74,16 @@ async def upload_files(
 @router.get("", response_class=JSONResponse)
 def list_files(
     contract_id: int,
+    request: Request,
+    response: Response,
     db=Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    tag = versioning.etag(request, current_user)
+    if (hit := versioning.not_modified(request, tag)) is not None:
+        return hit
+    response.headers.update(versioning.headers(tag))
+
     files = (
         db.query(ContractFile)
         .join(Contract)
@@ -104,14 +118,14 @@ def delete_file(
     if not f:
         raise HTTPException(status_code=404, detail="File not found")
 
-    # Datei vom Filesystem löschen
-    path = UPLOAD_DIR / f.file_path.split("/files/")[-1]
-    if path.exists():
-        path.unlink()
-
-    # DB‑Eintrag löschen
+    # DB‑Eintrag löschen, Datei räumt der Reaper im Hintergrund weg
+    file_path = f.file_path
     db.delete(f)
+    stats.bump(db, {"files": -1, "stored_bytes": -(f.size_bytes or 0)})
+    seq = versioning.bump(db, [current_user.id])[current_user.id]
+    versioning.tombstone(db, current_user.id, seq, files=[file_id])
     db.commit()
+    file_reaper.enqueue([file_path])
 
     return JSONResponse(status_code=status.HTTP_204_NO_CONTENT, content=None)
 
@@ -141,6 +155,8 @@ def preview_file(
         raise HTTPException(status_code=404, detail="File not found on disk")
 
     # Entschlüsseln und als StreamingResponse zurückgeben
+    from ..utils import crypto_utils
+
     def file_stream():
         with file_path.open("rb") as enc_file:
             buf = io.BytesIO()
@@ -1,20 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Optional
-from fastapi.responses import StreamingResponse, FileResponse
-import csv
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query, Body, BackgroundTasks, UploadFile, File
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import or_, select, delete, insert, update, func
+from sqlalchemy.exc import SQLAlchemyError
+from pydantic import ValidationError
+from typing import Optional, List, Dict, Any
+from collections import Counter
+from datetime import datetime
+from fastapi.responses import StreamingResponse
+import csv, io, json
 from io import StringIO, BytesIO
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.lib.units import cm
-from reportlab.platypus import Table, TableStyle, Image as RLImage
 import os
 
 from .. import models, schemas, database
 from .users import get_current_user
-from ..utils.email_utils import schedule_all_reminders
+from ..utils import file_reaper, stats, recurrence, versioning, page_cache, serialization, leader
 
 router = APIRouter(prefix="/contracts", tags=["contracts"])
 
@@ -30,31 +29,370 @@ def get_db():
 @router.post("/", response_model=schemas.Contract, status_code=status.HTTP_201_CREATED)
 def create_contract(
     contract: schemas.ContractCreate,
-    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
     data = contract.model_dump()
-    db_contract = models.Contract(**data, user_id=current_user.id)
-    db.add(db_contract); db.commit(); db.refresh(db_contract)
+    data["status"] = data["status"] or "active"     # as _prepare_row – counters need the real value
+    data.update(recurrence.derived_fields(
+        data["start_date"], data["end_date"], data["amount"], data["payment_interval"]
+    ))
+    seq = versioning.bump(db, [current_user.id])[current_user.id]
+    db_contract = models.Contract(**data, user_id=current_user.id, change_seq=seq)
+    db.add(db_contract)
+    stats.bump(db, stats.contract_deltas(db_contract.contract_type, db_contract.status))
+    db.commit(); db.refresh(db_contract)
 
-    scheduler = request.app.state.scheduler
-    schedule_all_reminders(db_contract, scheduler)
+    leader.sync_reminders([db_contract.id])
     return db_contract
 
+# ───────── Bulk create / update / delete ──────────────────────────
+MAX_BULK = 1000   # items per request
+
+# Reminder jobs depend only on these – other edits leave the scheduler alone
+_SCHEDULE_COLS = ("start_date", "end_date", "payment_interval", "status")
+
+def _check_bulk_size(n: int) -> None:
+    if n > MAX_BULK:
+        raise HTTPException(413, f"At most {MAX_BULK} items per request")
+
+def _error_text(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+    )
+
+def _prepare_row(c: schemas.ContractCreate, user_id: int) -> dict:
+    """Validated contract → insert mapping incl. derived columns."""
+    data = c.model_dump()
+    data["status"] = data["status"] or "active"
+    data.update(recurrence.derived_fields(
+        data["start_date"], data["end_date"], data["amount"], data["payment_interval"]
+    ))
+    data["user_id"] = user_id
+    return data
+
+def _insert_rows(db: Session, rows: list) -> None:
+    """One INSERT ... RETURNING executemany; sets r["id"], bumps stats + data versions (no commit)."""
+    versions = versioning.bump(db, {r["user_id"] for r in rows})
+    for r in rows:
+        r["change_seq"] = versions[r["user_id"]]
+    ids = db.execute(
+        insert(models.Contract).returning(models.Contract.id, sort_by_parameter_order=True),
+        rows,
+    ).scalars().all()
+    deltas = Counter()
+    for r, cid in zip(rows, ids):
+        r["id"] = cid
+        deltas.update(stats.contract_deltas(r["contract_type"], r["status"]))
+    stats.bump(db, deltas)
+
+@router.post("/bulk", response_model=schemas.BulkResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_contracts(
+    background_tasks: BackgroundTasks,
+    items: List[Dict[str, Any]] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Validate each item on its own, insert all valid ones in one statement."""
+    _check_bulk_size(len(items))
+    results, rows, index = [], [], []
+    for i, raw in enumerate(items):
+        try:
+            c = schemas.ContractCreate.model_validate(raw)
+        except ValidationError as e:
+            results.append({"index": i, "ok": False, "error": _error_text(e)})
+            continue
+        rows.append(_prepare_row(c, current_user.id)); index.append(i)
+
+    if rows:
+        _insert_rows(db, rows)
+        db.commit()
+        results += [{"index": i, "ok": True, "id": r["id"]} for i, r in zip(index, rows)]
+        background_tasks.add_task(leader.sync_reminders, [r["id"] for r in rows])
+
+    results.sort(key=lambda r: r["index"])
+    return {"succeeded": len(rows), "failed": len(items) - len(rows), "results": results}
+
+@router.patch("/bulk", response_model=schemas.BulkResult)
+def bulk_update_contracts(
+    background_tasks: BackgroundTasks,
+    items: List[Dict[str, Any]] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Partial updates (``{"id": .., <fields>}``) written with one executemany."""
+    _check_bulk_size(len(items))
+    C = models.Contract
+    results, updates = [], []
+    parsed = []
+    for i, raw in enumerate(items):
+        try:
+            parsed.append((i, schemas.ContractBulkUpdate.model_validate(raw)))
+        except ValidationError as e:
+            results.append({"index": i, "ok": False, "error": _error_text(e)})
+
+    current = {
+        row["id"]: dict(row)
+        for row in db.execute(
+            select(C.id, C.contract_type, C.amount, *(getattr(C, c) for c in _SCHEDULE_COLS))
+            .where(C.user_id == current_user.id, C.id.in_({u.id for _, u in parsed}))
+        ).mappings()
+    }
+    deltas, reschedule = Counter(), set()
+    for i, upd in parsed:
+        row = current.get(upd.id)
+        if row is None:
+            results.append({"index": i, "ok": False, "id": upd.id, "error": "Contract not found"})
+            continue
+        changes = upd.model_dump(exclude_none=True, exclude={"id"})
+        before = dict(row)
+        row.update(changes)
+        changes.update(recurrence.derived_fields(
+            row["start_date"], row["end_date"], row["amount"], row["payment_interval"]
+        ))
+        if (before["contract_type"], before["status"]) != (row["contract_type"], row["status"]):
+            deltas.update(stats.contract_deltas(before["contract_type"], before["status"], -1))
+            deltas.update(stats.contract_deltas(row["contract_type"], row["status"]))
+        if any(before[c] != row[c] for c in _SCHEDULE_COLS):
+            reschedule.add(upd.id)
+        updates.append({"id": upd.id, **changes})
+        results.append({"index": i, "ok": True, "id": upd.id})
+
+    if updates:
+        seq = versioning.bump(db, [current_user.id])[current_user.id]
+        for u in updates:
+            u["change_seq"] = seq
+        db.execute(update(models.Contract), updates)
+        stats.bump(db, deltas)
+        db.commit()
+    if reschedule:
+        background_tasks.add_task(leader.sync_reminders, reschedule)
+
+    results.sort(key=lambda r: r["index"])
+    ok = sum(r["ok"] for r in results)
+    return {"succeeded": ok, "failed": len(items) - ok, "results": results}
+
+@router.delete("/bulk", response_model=schemas.BulkResult)
+def bulk_delete_contracts(
+    payload: schemas.ContractBulkDelete,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Set-based delete of contracts + files, like delete_contract for many ids."""
+    _check_bulk_size(len(payload.ids))
+    C, F = models.Contract, models.ContractFile
+    owned = select(C.id).where(C.user_id == current_user.id, C.id.in_(set(payload.ids)))
+    found = set(db.execute(owned).scalars())
+
+    if found:
+        files = db.execute(
+            select(F.id, F.file_path, F.size_bytes).where(F.contract_id.in_(owned))
+        ).all()
+        deltas = Counter(files=-len(files), stored_bytes=-sum(s or 0 for *_, s in files))
+        for ctype, cstatus, n in db.execute(
+            select(C.contract_type, C.status, func.count())
+            .where(C.id.in_(owned)).group_by(C.contract_type, C.status)
+        ):
+            deltas.update(stats.contract_deltas(ctype, cstatus, -n))
+
+        no_sync = {"synchronize_session": False}
+        db.execute(delete(F).where(F.contract_id.in_(owned)), execution_options=no_sync)
+        db.execute(delete(C).where(C.id.in_(found)), execution_options=no_sync)
+        stats.bump(db, deltas)
+        seq = versioning.bump(db, [current_user.id])[current_user.id]
+        versioning.tombstone(db, current_user.id, seq,
+                             contracts=found, files=(fid for fid, *_ in files))
+        db.commit()
+
+        leader.sync_reminders(found)
+        file_reaper.enqueue(fp for _, fp, _ in files)
+
+    results = [
+        {"index": i, "ok": cid in found, "id": cid,
+         "error": None if cid in found else "Contract not found"}
+        for i, cid in enumerate(payload.ids)
+    ]
+    ok = sum(r["ok"] for r in results)
+    return {"succeeded": ok, "failed": len(results) - ok, "results": results}
+
+# ───────── Import (CSV / NDJSON, streaming) ───────────────────────
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+# CSV header → ContractCreate field; accepts export_contracts_csv headers and field names
+_CSV_FIELDS = {
+    "name": "name",
+    "type": "contract_type", "contract_type": "contract_type",
+    "start date": "start_date", "start_date": "start_date",
+    "end date": "end_date", "end_date": "end_date",
+    "amount": "amount",
+    "payment interval": "payment_interval", "payment_interval": "payment_interval",
+    "status": "status",
+    "notes": "notes",
+}
+
+def _csv_records(text):
+    """Yield (line_no, dict) per CSV row, mapping headers to schema fields."""
+    reader = csv.reader(text)
+    header = next(reader, None) or []
+    fields = [_CSV_FIELDS.get(h.strip().lower()) for h in header]
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        yield reader.line_num, {
+            f: (v.strip() or None) for f, v in zip(fields, row) if f
+        }
+
+def _ndjson_records(text):
+    for n, line in enumerate(text, start=1):
+        if line.strip():
+            try:
+                rec = json.loads(line)
+            except ValueError as e:
+                yield n, e
+                continue
+            yield n, rec if isinstance(rec, dict) else ValueError("Expected a JSON object")
+
+@router.post("/import")
+def import_contracts(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="'csv' or 'ndjson' (default: from file name)"),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=MAX_BULK),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Import contracts from a CSV (columns as in /export/csv) or NDJSON upload.
+    The file is parsed row by row and inserted in batches, each in its own
+    transaction.  The response is an NDJSON stream: one line per rejected
+    row, then a summary line.
+    """
+    fmt = (format or "").lower() or (
+        "ndjson" if (file.filename or "").lower().endswith((".ndjson", ".jsonl")) else "csv"
+    )
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(400, "format must be 'csv' or 'ndjson'")
+    user_id = current_user.id
+    # FastAPI closes the upload once this function returns – keep our own
+    # handle on the (spooled) temp file for the streaming generator
+    src = os.fdopen(os.dup(file.file.fileno()), "rb")
+    src.seek(0)
+
+    def run():
+        text = io.TextIOWrapper(src, encoding="utf-8-sig", newline="")
+        records = _csv_records(text) if fmt == "csv" else _ndjson_records(text)
+        db = database.SessionLocal()
+        imported = failed = 0
+        batch: list = []
+
+        def flush():
+            nonlocal imported
+            _insert_rows(db, batch)
+            db.commit()
+            leader.sync_reminders(r["id"] for r in batch)
+            imported += len(batch)
+            batch.clear()
+
+        try:
+            for line_no, rec in records:
+                try:
+                    if isinstance(rec, Exception):
+                        raise rec
+                    batch.append(_prepare_row(schemas.ContractCreate.model_validate(rec), user_id))
+                except (ValidationError, ValueError) as e:
+                    failed += 1
+                    msg = _error_text(e) if isinstance(e, ValidationError) else str(e)
+                    yield json.dumps({"row": line_no, "error": msg}) + "\n"
+                    continue
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+        except (UnicodeDecodeError, csv.Error) as e:
+            yield json.dumps({"error": f"Unreadable file: {e}"}) + "\n"
+        except SQLAlchemyError as e:
+            db.rollback()
+            yield json.dumps({"error": f"Database error, import stopped: {e.__class__.__name__}"}) + "\n"
+        finally:
+            db.close()
+            text.close()
+        yield json.dumps({"imported": imported, "failed": failed}) + "\n"
+
+    return StreamingResponse(run(), media_type="application/x-ndjson")
+
 # ───────── Read (paginated, filterable) ───────────────────────────
-@router.get("/", response_model=schemas.PaginatedContracts)
+# opt-in: select plain column tuples and encode them without per-item validation
+FAST_LISTS = os.getenv("FAST_CONTRACT_LISTS", "0") == "1"
+
+def _fields(spec: Optional[str], default: tuple) -> tuple:
+    try:
+        return serialization.parse_fields(spec, default)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+
+def _facets(query):
+    """
+    Counts and sums per contract_type and status for *query*'s WHERE clause,
+    in one GROUP BY over (contract_type, status).  Returns (json, total).
+    """
+    C = models.Contract
+    rows = query.order_by(None).with_entities(
+        C.contract_type, C.status, func.count(C.id),
+        func.coalesce(func.sum(C.amount), 0.0),
+        func.coalesce(func.sum(C.monthly_equivalent), 0.0),
+    ).group_by(C.contract_type, C.status).all()
+
+    by_type: dict = {}
+    by_status: dict = {}
+    total, amount, monthly = 0, 0.0, 0.0
+    for ctype, cstatus, n, amt, mon in rows:
+        total += n; amount += amt; monthly += mon
+        for bucket in (by_type.setdefault(ctype or "", {"count": 0, "amount": 0.0, "monthly": 0.0}),
+                       by_status.setdefault(cstatus or "", {"count": 0, "amount": 0.0, "monthly": 0.0})):
+            bucket["count"] += n; bucket["amount"] += amt; bucket["monthly"] += mon
+
+    for bucket in (*by_type.values(), *by_status.values()):
+        bucket["amount"] = round(bucket["amount"], 2)
+        bucket["monthly"] = round(bucket["monthly"], 2)
+    body = schemas.ContractFacets(
+        by_type=by_type, by_status=by_status,
+        amount=round(amount, 2), monthly=round(monthly, 2),
+    ).model_dump_json().encode()
+    return body, total
+
+@router.get("/", response_model=schemas.PaginatedContracts,
+            responses={200: {"model": schemas.PaginatedContractsFacets}})
 def read_contracts(
+    request: Request,
     skip : int  = Query(0,  ge=0),
     limit: int  = Query(10, ge=1, le=100),
     q    : Optional[str] = Query(None, description="Free-text search"),
     type : Optional[str] = Query(None, alias="type", description="Contract type filter (rent, insurance, streaming, salary, leasing, other)"),
     status: Optional[str] = Query(None, description="Status filter (active, cancelled, expired)"),
-    sort_by: Optional[str] = Query("start_date", description="Field to sort by (e.g., start_date, end_date, amount)"),
+    sort_by: Optional[str] = Query("start_date", description="Field to sort by (e.g., start_date, end_date, amount, next_due_date, monthly_equivalent)"),
     sort_dir: Optional[str] = Query("desc", description="Sort direction: 'asc' or 'desc'"),
+    due_from: Optional[datetime] = Query(None, description="next_due_date >= due_from"),
+    due_to  : Optional[datetime] = Query(None, description="next_due_date <= due_to"),
+    monthly_min: Optional[float] = Query(None, description="monthly_equivalent >= monthly_min"),
+    monthly_max: Optional[float] = Query(None, description="monthly_equivalent <= monthly_max"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all but notes, '*' = all)"),
+    facets: bool = Query(False, description="Add counts and sums per type/status for the current filter"),
     db  : Session         = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
+    tag = versioning.etag(request, current_user)
+    if (hit := versioning.not_modified(request, tag)) is not None:
+        return hit
+    selected = _fields(fields, serialization.LIST_FIELDS)
+    key = page_cache.make_key(current_user.id, versioning.stamp(current_user), {
+        "fields": ",".join(selected),
+        "skip": skip, "limit": limit, "q": q, "type": type, "status": status,
+        "sort_by": sort_by, "sort_dir": (sort_dir or "").lower(),
+        "due_from": due_from, "due_to": due_to,
+        "monthly_min": monthly_min, "monthly_max": monthly_max,
+        "facets": 1 if facets else None,
+    })
+    if (body := page_cache.get(key)) is not None:
+        return Response(body, media_type="application/json", headers=versioning.headers(tag))
+
     query = db.query(models.Contract).filter(models.Contract.user_id == current_user.id)
 
     if q:
@@ -65,46 +403,220 @@ def read_contracts(
         query = query.filter(models.Contract.contract_type == type)
     if status:
         query = query.filter(models.Contract.status == status)
+    if due_from:
+        query = query.filter(models.Contract.next_due_date >= due_from)
+    if due_to:
+        query = query.filter(models.Contract.next_due_date <= due_to)
+    if monthly_min is not None:
+        query = query.filter(models.Contract.monthly_equivalent >= monthly_min)
+    if monthly_max is not None:
+        query = query.filter(models.Contract.monthly_equivalent <= monthly_max)
 
     # Sorting
     if sort_by and hasattr(models.Contract, sort_by):
         order_column = getattr(models.Contract, sort_by)
         if sort_dir and sort_dir.lower() == "asc":
-            query = query.order_by(order_column.asc())
+            query = query.order_by(order_column.asc().nulls_last())
         else:
-            query = query.order_by(order_column.desc())
+            query = query.order_by(order_column.desc().nulls_last())
     else:
         # Default sort
         query = query.order_by(models.Contract.start_date.desc())
 
-    total  = query.count()
-    items  = query.offset(skip).limit(limit).all()
+    if facets:
+        facet_body, total = _facets(query)      # the grouped query also yields the total
+    else:
+        total = query.order_by(None).with_entities(func.count(models.Contract.id)).scalar()
+    page   = query.offset(skip).limit(limit)
+
+    if FAST_LISTS:
+        body = serialization.contract_page(
+            page.with_entities(*serialization.columns(selected)).all(), total, selected
+        )
+    else:
+        items = page.options(load_only(*serialization.columns(selected))).all()
+        body = serialization.page_model(selected).model_validate(
+            {"items": items, "total": total}
+        ).model_dump_json().encode()
+    if facets:
+        body = serialization.with_facets(body, facet_body)
+    page_cache.put(key, body)
+    return Response(body, media_type="application/json", headers=versioning.headers(tag))
+
+# ───────── Summary (Dashboard-KPIs) ───────────────────────────────
+@router.get("/summary", response_model=schemas.ContractSummary)
+def contracts_summary(
+    upcoming: int = Query(5, ge=0, le=50, description="How many next due payments to return"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Dashboard totals in one round trip, aggregated with GROUP BY in SQL.
+    Income/expense and by_type cover active contracts only; ``upcoming``
+    reads the stored next_due_date through its (user_id, next_due_date) index.
+    """
+    C = models.Contract
+    rows = db.execute(
+        select(C.contract_type, C.status, func.count(), func.sum(C.monthly_equivalent))
+        .where(C.user_id == current_user.id)
+        .group_by(C.contract_type, C.status)
+    ).all()
+
+    count, income, expense = 0, 0.0, 0.0
+    by_type: dict = {}
+    by_status: dict = {}
+    for ctype, cstatus, n, monthly in rows:
+        monthly = float(monthly or 0)
+        count += n
+        s = by_status.setdefault(cstatus, {"count": 0, "monthly": 0.0})
+        s["count"] += n; s["monthly"] += monthly
+        if cstatus != "active":
+            continue
+        t = by_type.setdefault(ctype, {"count": 0, "monthly": 0.0})
+        t["count"] += n; t["monthly"] += monthly
+        if ctype == "salary":
+            income += monthly
+        else:
+            expense += monthly
+
+    income_by_name = {}
+    if "salary" in by_type:
+        income_by_name = {
+            name: float(monthly or 0)
+            for name, monthly in db.execute(
+                select(C.name, func.sum(C.monthly_equivalent))
+                .where(C.user_id == current_user.id, C.status == "active",
+                       C.contract_type == "salary")
+                .group_by(C.name)
+            )
+        }
+
+    due = []
+    if upcoming:                                       # ix_contracts_user_next_due
+        due = db.execute(
+            select(C.id, C.name, C.contract_type, C.amount, C.next_due_date.label("due_date"))
+            .where(C.user_id == current_user.id, C.status == "active",
+                   C.next_due_date >= datetime.utcnow())
+            .order_by(C.next_due_date)
+            .limit(upcoming)
+        ).mappings().all()
+
+    return {
+        "count": count,
+        "income": income,
+        "expense": expense,
+        "net": income - expense,
+        "by_type": by_type,
+        "by_status": by_status,
+        "income_by_name": income_by_name,
+        "upcoming": due,
+    }
+
+# ───────── Forecast (Cashflow der nächsten Monate) ────────────────
+@router.get("/forecast", response_model=schemas.Forecast)
+def contracts_forecast(
+    months: int = Query(12, ge=1, le=120, description="Number of calendar months, starting with the current one"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Expected payments per month and type for all active contracts."""
+    from ..utils import forecast           # numpy erst beim ersten Aufruf laden
+
+    C = models.Contract
+    rows = db.execute(
+        select(C.start_date, C.end_date, C.amount, C.payment_interval, C.contract_type)
+        .where(C.user_id == current_user.id, C.status == "active")
+    ).all()
+    types = sorted({r[4] for r in rows})
+    fc = forecast.forecast(rows, types, datetime.utcnow().date(), months)
+
+    by_type = fc["series"]
+    zero = [0.0] * months
+    income = by_type.get("salary", zero)
+    expense = [round(sum(col), 2) for col in zip(zero, *(v for k, v in by_type.items() if k != "salary"))]
+    return {
+        "months": fc["months"],
+        "income": income,
+        "expense": expense,
+        "net": [round(i - e, 2) for i, e in zip(income, expense)],
+        "by_type": by_type,
+    }
 
-    return {"items": items, "total": total}
+# ───────── Delta sync ─────────────────────────────────────────────
+@router.get("/changes", response_model=schemas.ContractChanges)
+def contract_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="cursor of the previous response, 0 = full snapshot"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Contracts and files written after *since* plus the ids deleted since.
+    The cursor is the user's data_version; it is read before the rows, so
+    nothing committed later is skipped (it may be sent twice at most).
+    410 if tombstones after *since* were already pruned – sync from 0.
+    """
+    cursor = current_user.data_version or 0
+    if since > cursor or (since and since < (current_user.sync_floor or 0)):
+        raise HTTPException(status.HTTP_410_GONE, "Sync cursor expired, start again with since=0")
+    tag = versioning.etag(request, current_user)
+    if (hit := versioning.not_modified(request, tag)) is not None:
+        return hit
+
+    C, F, T = models.Contract, models.ContractFile, models.Tombstone
+    contracts = db.query(C).filter(C.user_id == current_user.id)
+    files = db.query(F).join(C).filter(C.user_id == current_user.id)
+    deleted = {"contract": [], "file": []}
+    if since:
+        contracts = contracts.filter(C.change_seq > since)
+        files = files.filter(F.change_seq > since)
+        for kind, oid in db.execute(
+            select(T.kind, T.object_id)
+            .where(T.user_id == current_user.id, T.change_seq > since)
+            .order_by(T.change_seq, T.id)
+        ):
+            deleted[kind].append(oid)
+
+    body = schemas.ContractChanges(
+        cursor=cursor,
+        contracts=contracts.order_by(C.id).all(),
+        files=files.order_by(F.id).all(),
+        deleted_contracts=deleted["contract"],
+        deleted_files=deleted["file"],
+    ).model_dump_json()
+    return Response(body, media_type="application/json", headers=versioning.headers(tag))
 
 # ───────── Read by id ─────────────────────────────────────────────
 @router.get("/{contract_id}", response_model=schemas.Contract)
 def read_contract(
     contract_id: int,
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
+    tag = versioning.etag(request, current_user)
+    if (hit := versioning.not_modified(request, tag)) is not None:
+        return hit
+    selected = _fields(fields, serialization.CONTRACT_FIELDS)
+
     contract = (
         db.query(models.Contract)
+        .options(load_only(*serialization.columns(selected)))
         .filter(models.Contract.id == contract_id,
                 models.Contract.user_id == current_user.id)
         .first()
     )
     if not contract:
         raise HTTPException(404, "Contract not found")
-    return contract
+    body = serialization.item_model(selected).model_validate(contract).model_dump_json()
+    return Response(body, media_type="application/json", headers=versioning.headers(tag))
 
 # ───────── Update ────────────────────────────────────────────────
 @router.patch("/{contract_id}", response_model=schemas.Contract)
 def update_contract(
     contract_id: int,
     upd: schemas.ContractUpdate,
-    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -117,13 +629,25 @@ def update_contract(
     if not contract:
         raise HTTPException(404, "Contract not found")
 
+    old_type, old_status = contract.contract_type, contract.status
+    old_schedule = [getattr(contract, c) for c in _SCHEDULE_COLS]
     for field, value in upd.model_dump(exclude_none=True).items():
         setattr(contract, field, value)
+    for field, value in recurrence.derived_fields(
+        contract.start_date, contract.end_date, contract.amount, contract.payment_interval
+    ).items():
+        setattr(contract, field, value)
 
+    if (old_type, old_status) != (contract.contract_type, contract.status):
+        deltas = stats.contract_deltas(old_type, old_status, -1)
+        deltas.update(stats.contract_deltas(contract.contract_type, contract.status))
+        stats.bump(db, deltas)
+    contract.change_seq = versioning.bump(db, [current_user.id])[current_user.id]
+    reschedule = old_schedule != [getattr(contract, c) for c in _SCHEDULE_COLS]
     db.commit(); db.refresh(contract)
 
-    scheduler = request.app.state.scheduler
-    schedule_all_reminders(contract, scheduler, replace=True)
+    if reschedule:
+        leader.sync_reminders([contract.id])
     return contract
 
 # ───────── Delete ────────────────────────────────────────────────
@@ -141,30 +665,42 @@ def delete_contract(
     )
     if not contract:
         raise HTTPException(404, "Contract not found")
+    out = schemas.Contract.model_validate(contract)
 
-    # Alle zugehörigen Dateien im Dateisystem löschen
-    from ..config import UPLOAD_DIR
-    files = db.query(models.ContractFile).filter(models.ContractFile.contract_id == contract.id).all()
-    for f in files:
-        if f.file_path:
-            file_name = f.file_path.split("/files/")[-1]
-            file_path = UPLOAD_DIR / file_name
-            if file_path.exists():
-                try:
-                    file_path.unlink()
-                except Exception:
-                    pass  # Fehler beim Löschen ignorieren
-        db.delete(f)
+    # Dateien + Vertrag set-basiert löschen, Dateisystem räumt der Reaper auf
+    rows = db.execute(
+        select(models.ContractFile.id, models.ContractFile.file_path, models.ContractFile.size_bytes)
+        .where(models.ContractFile.contract_id == contract.id)
+    ).all()
+    paths = [fp for _, fp, _ in rows]
+    db.execute(delete(models.ContractFile)
+               .where(models.ContractFile.contract_id == contract.id),
+               execution_options={"synchronize_session": False})
     db.delete(contract)
+
+    deltas = stats.contract_deltas(contract.contract_type, contract.status, -1)
+    deltas.update(files=-len(rows), stored_bytes=-sum(size or 0 for *_, size in rows))
+    stats.bump(db, deltas)
+    seq = versioning.bump(db, [current_user.id])[current_user.id]
+    versioning.tombstone(db, current_user.id, seq,
+                         contracts=[contract_id], files=[fid for fid, *_ in rows])
     db.commit()
-    return contract
+
+    leader.sync_reminders([contract_id])
+    file_reaper.enqueue(paths)
+    return out
 
 # ───────── Export CSV ────────────────────────────────────────────
 @router.get("/export/csv")
 def export_contracts_csv(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
+    tag = versioning.etag(request, current_user)
+    if (hit := versioning.not_modified(request, tag)) is not None:
+        return hit
+
     contracts = db.query(models.Contract).filter(models.Contract.user_id == current_user.id).all()
     si = StringIO()
     writer = csv.writer(si)
@@ -187,16 +723,29 @@ def export_contracts_csv(
         si,
         media_type="text/csv",
         headers={
-            "Content-Disposition": "attachment; filename=contracts.csv"
+            "Content-Disposition": "attachment; filename=contracts.csv",
+            **versioning.headers(tag),
         },
     )
 
 # ───────── Export PDF ────────────────────────────────────────────
 @router.get("/export/pdf")
 def export_contracts_pdf(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
+    tag = versioning.etag(request, current_user)
+    if (hit := versioning.not_modified(request, tag)) is not None:
+        return hit
+
+    # reportlab erst hier laden – hält den App-Import schlank
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from reportlab.lib import colors
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Table, TableStyle
+
     contracts = db.query(models.Contract).filter(models.Contract.user_id == current_user.id).all()
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=A4)
@@ -271,4 +820,4 @@ def export_contracts_pdf(
             c.showPage()
     c.save()
     buffer.seek(0)
-    return StreamingResponse(buffer, media_type="application/pdf", headers={"Content-Disposition": "attachment; filename=contracts.pdf"})
+    return StreamingResponse(buffer, media_type="application/pdf", headers={"Content-Disposition": "attachment; filename=contracts.pdf", **versioning.headers(tag)})
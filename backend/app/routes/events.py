@@ -0,0 +1,101 @@
+# backend/app/routes/events.py
+"""
+Server-sent events per user (see utils/events.py).
+
+POST /events/ticket   → short-lived stream token – EventSource cannot send
+                         an Authorization header, so the token goes in the URL
+GET  /events/stream   → text/event-stream; resumes after ``Last-Event-ID``
+                         (header, or ``last_event_id`` when the client
+                         reconnects with a fresh ticket) and sends a comment
+                         line every EVENTS_HEARTBEAT seconds
+"""
+import os
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from jose import JWTError, jwt
+
+from .. import models, database
+from .users import get_current_user, _create_token, SECRET_KEY, ALGORITHM
+from ..utils import events
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+HEARTBEAT  = float(os.getenv("EVENTS_HEARTBEAT", "15"))       # seconds
+TICKET_TTL = timedelta(hours=1)
+RETRY_MS   = 3000                                             # client reconnect delay
+
+
+@router.post("/ticket")
+def events_ticket(current_user: models.User = Depends(get_current_user)):
+    ticket = _create_token({"sub": current_user.email, "scope": "events"}, ttl=TICKET_TTL)
+    return {"ticket": ticket, "expires_in": int(TICKET_TTL.total_seconds())}
+
+
+def _ticket_user_id(ticket: str) -> int:
+    exc = HTTPException(401, "Invalid or expired ticket")
+    try:
+        data = jwt.decode(ticket, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise exc
+    if data.get("scope") != "events" or not data.get("sub"):
+        raise exc
+    db = database.SessionLocal()          # not a dependency: the stream outlives the request
+    try:
+        uid = db.query(models.User.id).filter(models.User.email == data["sub"]).scalar()
+    finally:
+        db.close()
+    if uid is None:
+        raise exc
+    return uid
+
+
+@router.get("/stream")
+async def events_stream(
+    request: Request,
+    ticket: str = Query(..., description="from POST /events/ticket"),
+    last_event_id: Optional[str] = Query(None, description="resume point if the Last-Event-ID header cannot be sent"),
+):
+    uid = await run_in_threadpool(_ticket_user_id, ticket)
+    resume = request.headers.get("last-event-id") or last_event_id
+    sub = events.subscribe(uid)           # before replay, so nothing falls in between
+
+    async def stream():
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            last = None
+            if resume:
+                missed = events.replay(uid, resume)
+                if missed is None:
+                    gap = events.resync(uid)
+                    yield events.frame(gap)
+                    last = events.parse_id(gap.id)
+                else:
+                    for e in missed:
+                        yield events.frame(e)
+                    last = events.parse_id(missed[-1].id if missed else resume)
+            while not await request.is_disconnected():
+                e = await sub.get(HEARTBEAT)
+                if sub.overflow:
+                    sub.overflow = False
+                    gap = events.resync(uid)
+                    yield events.frame(gap)
+                    last = events.parse_id(gap.id)
+                if e is None:
+                    yield b": ping\n\n"
+                    continue
+                key = events.parse_id(e.id)
+                if last is not None and key is not None and key <= last:
+                    continue                  # already sent by replay / covered by resync
+                yield events.frame(e)
+                last = key
+        finally:
+            events.unsubscribe(sub)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",            # nginx: don't buffer the stream
+    })
@@ -0,0 +1,29 @@
+# backend/app/routes/health.py
+"""
+Unauthenticated probes for load balancers / orchestrators.
+
+GET /healthz   →  process is up (no I/O at all)
+GET /readyz    →  last background probe saw DB + scheduler healthy
+"""
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ..utils import health
+
+router = APIRouter(tags=["health"])
+
+_OK        = b'{"status":"ok"}'
+_READY     = b'{"status":"ready"}'
+_NOT_READY = b'{"status":"not ready"}'
+
+
+@router.get("/healthz", include_in_schema=False)
+def healthz():
+    return Response(_OK, media_type="application/json")
+
+
+@router.get("/readyz", include_in_schema=False)
+def readyz():
+    if health.ready():
+        return Response(_READY, media_type="application/json")
+    return Response(_NOT_READY, status_code=503, media_type="application/json")
@@ -1,13 +1,13 @@
 # backend/app/routes/users.py
 # ────────────────────────────────────────────────────────────────
-import os, secrets, smtplib, pathlib
-import time
+import os, secrets
+import base64, json, time
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Optional
-from urllib.parse import urlencode
+from typing import Optional
 
 from fastapi import (
-    APIRouter, Depends, HTTPException, BackgroundTasks, Request, status, UploadFile, File, Form
+    APIRouter, Depends, HTTPException, BackgroundTasks, Request, status, UploadFile, File, Form, Query
 )
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.responses import JSONResponse
@@ -15,13 +15,13 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select, delete, func, or_, and_
 from sqlalchemy.exc import SQLAlchemyError
 from dotenv import load_dotenv
 
 from .. import models, schemas, database
 from ..utils import email_utils                     #  ← send_code_via_email, send_broadcast
-from ..utils.email_utils import EMAIL_HOST, EMAIL_PORT
+from ..utils import events, file_reaper, health, leader, metrics, page_cache, stats
 
 load_dotenv()
 
@@ -66,12 +66,6 @@ def is_login_allowed(email):
 def get_db():
     db = database.SessionLocal()
     try:
-        # einmalig Admin-User anlegen
-        if not db.query(models.User).filter(models.User.email == "admin@admin").first():
-            db.add(models.User(email="admin@admin",
-                               hashed_password=_hash("admin"),
-                               is_admin=True))
-            db.commit()
         yield db
     finally:
         db.close()
@@ -96,7 +90,9 @@ def register(u: schemas.UserCreate, db: Session = Depends(get_db)):
             qr_url = pyotp.totp.TOTP(secret).provisioning_uri(name=u.email, issuer_name="PlanPago")
         except Exception as e:
             raise HTTPException(500, f"TOTP setup failed: {e}")
-    db.add(user); db.commit(); db.refresh(user)
+    db.add(user)
+    stats.bump(db, {"users": 1})
+    db.commit(); db.refresh(user)
     resp = {"id": user.id, "email": user.email, "twofa_method": user.twofa_method}
     if qr_url:
         resp["totp_qr_url"] = qr_url
@@ -125,6 +121,8 @@ def login_step1(
 
     # Trusted-Window 10 min
     if user.last_2fa_at and (datetime.utcnow() - user.last_2fa_at) < timedelta(minutes=10):
+        user.last_login_at = datetime.utcnow()
+        db.commit()
         return {"access_token": _create_token({"sub": user.email}),
                 "token_type":   "bearer"}
 
@@ -170,7 +168,7 @@ def verify_code(payload: CodeVerify, db: Session = Depends(get_db)):
         totp = pyotp.TOTP(user.totp_secret)
         if not totp.verify(payload.code, valid_window=1):
             raise HTTPException(400, "Invalid or expired code")
-        user.last_2fa_at = datetime.utcnow()
+        user.last_2fa_at = user.last_login_at = datetime.utcnow()
         db.commit()
         token = _create_token({"sub": user.email})
         return {"access_token": token, "token_type": "bearer"}
@@ -184,7 +182,7 @@ def verify_code(payload: CodeVerify, db: Session = Depends(get_db)):
     if not vc:
         raise HTTPException(400, "Invalid or expired code")
 
-    user.last_2fa_at = datetime.utcnow()
+    user.last_2fa_at = user.last_login_at = datetime.utcnow()
     db.delete(vc); db.commit()
     token = _create_token({"sub": user.email})
     return {"access_token": token, "token_type": "bearer"}
@@ -196,7 +194,7 @@ def get_current_user(token: str = Depends(oauth2_scheme),
     try:
         data  = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email = data.get("sub")
-        if not email:
+        if not email or data.get("scope"):      # scoped tokens (events ticket) are no API login
             raise JWTError()
     except JWTError:
         raise exc
@@ -284,6 +282,8 @@ def update_confirm(payload: UpdateConfirm, db: Session = Depends(get_db)):
         if data.get("new_password"):
             user.hashed_password = data["new_password"]
         db.commit(); db.refresh(user)
+        if data.get("new_email"):
+            _sync_user_reminders(db, user.id)       # Empfänger steht in den Jobs
         return user
 
     # Standard: E-Mail-Code
@@ -301,63 +301,227 @@ def update_confirm(payload: UpdateConfirm, db: Session = Depends(get_db)):
         user.hashed_password = data["new_password"]
 
     db.delete(vc); db.commit(); db.refresh(user)
+    if data.get("new_email"):
+        _sync_user_reminders(db, user.id)
     return user
 
 # ───────── 7) Settings ──────────────────────────────────────────
+def _sync_user_reminders(db: Session, uid: int) -> None:
+    """Reminder jobs carry the address and depend on the reminder settings."""
+    leader.sync_reminders(
+        db.scalars(select(models.Contract.id).where(models.Contract.user_id == uid)).all()
+    )
+
 @router.patch("/me/settings", response_model=schemas.User)
 def change_settings(
     s:   schemas.UserSettings,
     cur: models.User = Depends(get_current_user),
     db:  Session     = Depends(get_db),
 ):
+    digest = cur.reminder_digest if s.reminder_digest is None else s.reminder_digest
+    toggled = (cur.email_reminders_enabled, cur.reminder_digest) != (s.email_reminders_enabled, digest)
     cur.email_reminders_enabled = s.email_reminders_enabled
+    cur.reminder_digest = digest
     cur.country  = s.country
     cur.currency = s.currency
     db.commit(); db.refresh(cur)
+    if toggled:
+        _sync_user_reminders(db, cur.id)
     return cur
 
 # ───────── 8) Account löschen ──────────────────────────────────
+def _purge_user(db: Session, uid: int) -> None:
+    """
+    Delete a user with all dependent rows using set-based statements in a
+    single transaction.  Reminder jobs are dropped afterwards and the
+    encrypted files are handed to the background reaper.
+    """
+    contract_ids = select(models.Contract.id).where(models.Contract.user_id == uid)
+    cids  = db.execute(contract_ids).scalars().all()
+    files = db.execute(
+        select(models.ContractFile.file_path, models.ContractFile.size_bytes)
+        .where(models.ContractFile.contract_id.in_(contract_ids))
+    ).all()
+    paths = [fp for fp, _ in files]
+
+    deltas = Counter(users=-1, files=-len(files),
+                     stored_bytes=-sum(size or 0 for _, size in files))
+    for ctype, cstatus, n in db.execute(
+        select(models.Contract.contract_type, models.Contract.status, func.count())
+        .where(models.Contract.user_id == uid)
+        .group_by(models.Contract.contract_type, models.Contract.status)
+    ):
+        deltas.update(stats.contract_deltas(ctype, cstatus, -n))
+
+    no_sync = {"synchronize_session": False}
+    db.execute(delete(models.ContractFile)
+               .where(models.ContractFile.contract_id.in_(contract_ids)),
+               execution_options=no_sync)
+    db.execute(delete(models.Contract).where(models.Contract.user_id == uid),
+               execution_options=no_sync)
+    db.execute(delete(models.VerificationCode)
+               .where(models.VerificationCode.user_id == uid),
+               execution_options=no_sync)
+    db.execute(delete(models.Tombstone).where(models.Tombstone.user_id == uid),
+               execution_options=no_sync)
+    db.execute(delete(models.ImpersonationRequest)
+               .where(or_(models.ImpersonationRequest.user_id == uid,
+                          models.ImpersonationRequest.admin_id == uid)),
+               execution_options=no_sync)
+    db.execute(delete(models.User).where(models.User.id == uid),
+               execution_options=no_sync)
+    stats.bump(db, deltas)
+    db.commit()
+
+    leader.sync_reminders(cids)
+    # other workers' entries can't match a new owner of the id (User.cache_epoch)
+    page_cache.invalidate([uid])
+    file_reaper.enqueue(paths)
+
 @router.delete("/me", response_model=schemas.User)
 def delete_me(cur: models.User = Depends(get_current_user),
               db:  Session     = Depends(get_db)):
-    # Alle Contracts des Users abfragen
-    contracts = db.query(models.Contract).filter(models.Contract.user_id == cur.id).all()
-    from ..config import UPLOAD_DIR
-    import os
-    # Für alle Contracts alle zugehörigen ContractFiles abfragen und löschen
-    for contract in contracts:
-        files = db.query(models.ContractFile).filter(models.ContractFile.contract_id == contract.id).all()
-        for f in files:
-            # Datei vom Filesystem löschen
-            if f.file_path:
-                file_name = f.file_path.split("/files/")[-1]
-                file_path = UPLOAD_DIR / file_name
-                if file_path.exists():
-                    try:
-                        file_path.unlink()
-                    except Exception:
-                        pass  # Fehler beim Löschen ignorieren
-    # Contracts und User löschen wie bisher
-    db.query(models.Contract).filter(models.Contract.user_id == cur.id).delete()
-    db.delete(cur); db.commit()
-    return cur
+    out = schemas.User.model_validate(cur)
+    _purge_user(db, cur.id)
+    return out
 
 # ───────── 9) Admin – User-Verwaltung ──────────────────────────
-@router.get("/admin/users", response_model=List[schemas.User])
-def admin_users(cur: models.User = Depends(get_current_user),
-                db:  Session     = Depends(get_db)):
+_USER_SORTS = ("id", "email", "last_login", "contracts", "files", "bytes")
+
+def _encode_cursor(value, uid: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, uid]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str, sort_by: str):
+    try:
+        value, uid = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if sort_by == "last_login":
+            value = datetime.fromisoformat(value)
+        return value, int(uid)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+
+def _user_aggregate_key(sort_by: str):
+    """Correlated per-user count/sum for sorting – one index lookup per user."""
+    if sort_by == "contracts":
+        sub = select(func.count()).where(models.Contract.user_id == models.User.id)
+    else:
+        col = func.count(models.ContractFile.id) if sort_by == "files" \
+            else func.coalesce(func.sum(models.ContractFile.size_bytes), 0)
+        sub = (
+            select(col)
+            .join(models.Contract, models.ContractFile.contract_id == models.Contract.id)
+            .where(models.Contract.user_id == models.User.id)
+        )
+    return sub.correlate(models.User).scalar_subquery()
+
+def _user_aggregates(db: Session, uids: list[int]) -> dict:
+    """{uid: {contracts, files, stored_bytes}} for one page of users."""
+    out = {uid: {"contracts": 0, "files": 0, "stored_bytes": 0} for uid in uids}
+    if not uids:
+        return out
+    for uid, n in db.execute(
+        select(models.Contract.user_id, func.count())
+        .where(models.Contract.user_id.in_(uids))
+        .group_by(models.Contract.user_id)
+    ):
+        out[uid]["contracts"] = n
+    for uid, n, size in db.execute(
+        select(models.Contract.user_id, func.count(models.ContractFile.id),
+               func.coalesce(func.sum(models.ContractFile.size_bytes), 0))
+        .join(models.ContractFile, models.ContractFile.contract_id == models.Contract.id)
+        .where(models.Contract.user_id.in_(uids))
+        .group_by(models.Contract.user_id)
+    ):
+        out[uid]["files"], out[uid]["stored_bytes"] = n, size
+    return out
+
+@router.get("/admin/users", response_model=schemas.PaginatedUsers)
+def admin_users(
+    limit : int           = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    q     : Optional[str] = Query(None, description="Search in e-mail"),
+    sort_by : str         = Query("id", description="id, email, last_login, contracts, files, bytes"),
+    sort_dir: str         = Query("asc", description="'asc' or 'desc'"),
+    cur: models.User = Depends(get_current_user),
+    db:  Session     = Depends(get_db),
+):
+    """
+    User directory for the admin panel, keyset-paginated on (sort value, id).
+
+    The page of users is selected first; contract/file counts and stored
+    bytes are then aggregated for just those ids.  Sorting by one of the
+    counts uses a correlated subquery on the indexed ``user_id`` instead of
+    grouping the whole contracts table.  ``total`` is only counted for the
+    first page (no cursor).
+    """
     _ensure_admin(cur)
-    return db.query(models.User).all()
+    if sort_by not in _USER_SORTS:
+        raise HTTPException(400, f"sort_by must be one of {', '.join(_USER_SORTS)}")
+    desc = sort_dir.lower() == "desc"
+
+    key = {
+        "id":         models.User.id,
+        "email":      models.User.email,
+        "last_login": func.coalesce(models.User.last_login_at, datetime(1970, 1, 1)),
+    }.get(sort_by)
+    if key is None:
+        key = _user_aggregate_key(sort_by)
+
+    where = []
+    if q:
+        where.append(models.User.email.ilike(f"%{q}%"))
+    total = None
+    if not cursor:
+        total = db.execute(
+            select(func.count()).select_from(models.User).where(*where)
+        ).scalar_one()
+    else:
+        value, after_id = _decode_cursor(cursor, sort_by)
+        if sort_by == "id":
+            where.append(models.User.id < after_id if desc else models.User.id > after_id)
+        elif desc:
+            where.append(or_(key < value, and_(key == value, models.User.id < after_id)))
+        else:
+            where.append(or_(key > value, and_(key == value, models.User.id > after_id)))
+
+    rows = db.execute(
+        select(models.User, key)
+        .where(*where)
+        .order_by(key.desc() if desc else key.asc(),
+                  models.User.id.desc() if desc else models.User.id.asc())
+        .limit(limit + 1)
+    ).all()
+
+    page = rows[:limit]
+    counts = _user_aggregates(db, [u.id for u, _ in page])
+    items = [
+        schemas.AdminUser(
+            id=u.id, email=u.email, is_admin=u.is_admin,
+            email_reminders_enabled=u.email_reminders_enabled,
+            reminder_digest=u.reminder_digest,
+            country=u.country, currency=u.currency,
+            last_login_at=u.last_login_at,
+            **counts[u.id],
+        )
+        for u, _ in page
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        last_user, last_value = rows[limit - 1]
+        next_cursor = _encode_cursor(last_value, last_user.id)
+    return {"items": items, "total": total, "next_cursor": next_cursor}
 
 @router.delete("/admin/users/{uid}", status_code=204)
 def admin_del(uid: int,
               cur: models.User = Depends(get_current_user),
               db:  Session     = Depends(get_db)):
     _ensure_admin(cur)
-    tgt = db.get(models.User, uid)
-    if not tgt:
+    if not db.query(models.User.id).filter(models.User.id == uid).first():
         raise HTTPException(404, "User not found")
-    db.delete(tgt); db.commit()
+    _purge_user(db, uid)
 
 # ───────── 10) Admin – Impersonate / Health / Broadcast ────────
 @router.post("/admin/impersonate-request/{uid}", status_code=201)
@@ -406,6 +570,8 @@ def admin_impersonate_confirm(token: str, db: Session = Depends(get_db)):
     req.confirmed = True
     req.confirmed_at = datetime.utcnow()
     db.commit()
+    events.publish(req.admin_id, "impersonation",
+                   {"request_id": req.id, "user_id": req.user_id, "confirmed": True})
     return "Admin access has been approved. You may close this window."
 
 @router.post("/admin/impersonate/{uid}", response_model=schemas.Token)
@@ -424,28 +590,12 @@ def admin_impersonate(uid: int,
             "token_type":   "bearer"}
 
 @router.get("/admin/health")
-def admin_health(cur: models.User = Depends(get_current_user),
-                 db:  Session     = Depends(get_db)):
+def admin_health(cur: models.User = Depends(get_current_user)):
     _ensure_admin(cur)
-    # DB
-    try:
-        db.execute(text("SELECT 1")); db_ok = True
-    except Exception:
-        db_ok = False
-    # SMTP
-    try:
-        with smtplib.SMTP(EMAIL_HOST, EMAIL_PORT, timeout=5) as s:
-            s.ehlo()
-        smtp_ok = True
-    except Exception:
-        smtp_ok = False
-    # Scheduler
-    try:
-        from ..main import app
-        sched_jobs = len(app.state.scheduler.get_jobs())
-    except Exception:
-        sched_jobs = 0
-        
+    # DB / SMTP / Scheduler / Disk werden im Hintergrund geprüft (utils.health),
+    # hier wird nur der letzte Stand ausgeliefert
+    snap = health.snapshot() or {"checked_at": None}
+
     # Server Uptime - Linux-spezifische Methode
     try:
         with open('/proc/uptime', 'r') as f:
@@ -469,7 +619,17 @@ def admin_health(cur: models.User = Depends(get_current_user),
         # Keine Uptime bekannt, aber wenigstens aktuelle Serverzeit
         uptime = f"Active: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
     
-    return {"db": db_ok, "smtp": smtp_ok, "scheduler_jobs": sched_jobs, "uptime": uptime}
+    return {**snap, "uptime": uptime,
+            "page_cache": page_cache.info(), "events": events.info(),
+            "leader": leader.info(),
+            "metrics": metrics.snapshot()}
+
+@router.get("/admin/stats")
+def admin_stats(cur: models.User = Depends(get_current_user),
+                db:  Session     = Depends(get_db)):
+    """System-wide totals from the incrementally maintained stats table."""
+    _ensure_admin(cur)
+    return stats.read(db)
 
 # ───────── Broadcast an alle Nutzer ─────────────────────────────
 class _Broadcast(BaseModel):
@@ -616,6 +776,8 @@ def admin_reset_database(
             new_db.commit()
         finally:
             new_db.close()
+        stats.reconcile()
+        page_cache.clear()
             
         return {"message": "Database has been reset successfully. All data has been deleted."}
         
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel, ConfigDict
 
 # ───────── User schemas ────────────────────────────────────────────
@@ -15,11 +15,20 @@ class UserCreate(UserBase):
 class User(UserBase):
     id: int
     email_reminders_enabled: bool
+    reminder_digest: bool = False
     country: Optional[str] = None
     currency: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
 
 
+class AdminUser(User):
+    is_admin: bool
+    last_login_at: Optional[datetime] = None
+    contracts: int = 0
+    files: int = 0
+    stored_bytes: int = 0
+
+
 class UserUpdate(BaseModel):
     old_password: str
     email: Optional[str] = None
@@ -29,6 +38,7 @@ class UserUpdate(BaseModel):
 
 class UserSettings(BaseModel):
     email_reminders_enabled: bool
+    reminder_digest: Optional[bool] = None   # None: unchanged
     country: Optional[str] = None
     currency: Optional[str] = None
 
@@ -61,11 +71,68 @@ class ContractUpdate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ContractBulkUpdate(ContractUpdate):
+    id: int
+
+
+class ContractBulkDelete(BaseModel):
+    ids: List[int]
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
 class Contract(ContractBase):
     id: int
+    next_due_date: Optional[datetime] = None
+    monthly_equivalent: Optional[float] = None
+    updated_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
 
+# ───────── Contract summary (dashboard) ───────────────────────────
+class SummaryBucket(BaseModel):
+    count: int
+    monthly: float  # monthly-equivalent amount
+
+
+class UpcomingPayment(BaseModel):
+    id: int
+    name: str
+    contract_type: str
+    amount: float
+    due_date: datetime
+
+
+class ContractSummary(BaseModel):
+    count: int
+    income: float   # monthly equivalent of active salary contracts
+    expense: float  # monthly equivalent of all other active contracts
+    net: float
+    by_type: Dict[str, SummaryBucket]    # active contracts only
+    by_status: Dict[str, SummaryBucket]
+    income_by_name: Dict[str, float] = {}  # active salary contracts, monthly, by name
+    upcoming: List[UpcomingPayment]
+
+
+class Forecast(BaseModel):
+    months: List[str]                  # "YYYY-MM"
+    income: List[float]
+    expense: List[float]
+    net: List[float]
+    by_type: Dict[str, List[float]]
+
+
 # ───────── ContractFile schema ────────────────────────────────────
 class ContractFile(BaseModel):
     id: int
@@ -73,9 +140,19 @@ class ContractFile(BaseModel):
     file_path: str
     original_filename: str
     uploaded_at: datetime
+    updated_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
 
 
+# ───────── Delta sync ─────────────────────────────────────────────
+class ContractChanges(BaseModel):
+    cursor: int                      # pass as ?since= on the next call
+    contracts: List[Contract]        # created or modified after since
+    files: List[ContractFile]
+    deleted_contracts: List[int]     # apply deletions first – SQLite may reuse ids
+    deleted_files: List[int]
+
+
 # ───────── Auth schemas ───────────────────────────────────────────
 class Token(BaseModel):
     access_token: str
@@ -92,6 +169,29 @@ class PaginatedContracts(BaseModel):
     total: int
 
 
+class FacetBucket(BaseModel):
+    count: int
+    amount: float   # sum of amount
+    monthly: float  # sum of monthly_equivalent
+
+
+class ContractFacets(BaseModel):
+    by_type: Dict[str, FacetBucket]
+    by_status: Dict[str, FacetBucket]
+    amount: float
+    monthly: float
+
+
+class PaginatedContractsFacets(PaginatedContracts):
+    facets: ContractFacets   # only with ?facets=true, same filter as the page
+
+
+class PaginatedUsers(BaseModel):
+    items: List[AdminUser]
+    total: Optional[int] = None        # only on the first page (no cursor)
+    next_cursor: Optional[str] = None  # opaque keyset cursor, None on last page
+
+
 # ───────── ImpersonationRequest schemas ───────────────────────────
 class ImpersonationRequest(BaseModel):
     id: int
@@ -1,7 +1,7 @@
 import os
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
-KEY_PATH = os.path.join(os.path.dirname(__file__), '../../encryption.key')
+KEY_PATH = os.getenv('ENCRYPTION_KEY_PATH', os.path.join(os.path.dirname(__file__), '../../encryption.key'))
 KEY_SIZE = 32  # 256 bit
 NONCE_SIZE = 12  # 96 bit, recommended for GCM
 
@@ -112,6 +112,22 @@ TEMPLATES = {
             )
         }
     },
+    # daily digest (User.reminder_digest): one mail, one line per reminder
+    "digest": {
+        "subject": "PlanPago: {count} reminder(s) for {date}",
+        "body": (
+            "Hello,\n\n"
+            "here is your PlanPago overview for {date}:\n\n"
+            "{items}\n\n"
+        ),
+        "payment": {
+            "salary": "• Salary '{name}': {amount} EUR will be received in {days} days (on {date})",
+            "default": "• {name} ({type}): {amount} EUR due in {days} days (on {date})",
+        },
+        "end": {
+            "default": "• {name} ({type}): contract ends in {days} days (on {date})",
+        },
+    },
     "admin_impersonation_request": {
         "subject": "PlanPago: Admin login request",
         "body": (
@@ -4,16 +4,21 @@ from __future__ import annotations
 import os
 import smtplib
 import mimetypes
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 from email.message import EmailMessage
 from pathlib import Path
-from typing import Iterable, Sequence, Tuple
+from typing import Dict, Iterable, Sequence, Tuple
+from weakref import WeakKeyDictionary
+from zoneinfo import ZoneInfo
 
-from dateutil.relativedelta import relativedelta
+from apscheduler.jobstores.base import JobLookupError
+from sqlalchemy import and_, or_, select
 from dotenv import load_dotenv
 
 from ..database import SessionLocal
+from ..logging_config import LOG_DIR
 from ..models import Contract, User
+from . import metrics, recurrence, stats
 from .email_templates import TEMPLATES
 
 # ────────────────────────────────────────────────────────────────
@@ -26,12 +31,13 @@ EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
 EMAIL_USER = os.getenv("EMAIL_USER")
 EMAIL_PASS = os.getenv("EMAIL_PASS")
 
+REMINDER_DAYS = (3, 1)                          # days before payment / contract end
+REMINDER_TZ   = ZoneInfo("Europe/Berlin")       # reminders go out at 03:00 local time
+DIGEST_BATCH  = 500                             # users per query / SMTP session
+
 # ────────────────────────────────────────────────────────────────
-#  LOG DIRECTORY & FILES
+#  LOG FILES  (LOG_DIR is created by setup_logging / on first write)
 # ────────────────────────────────────────────────────────────────
-LOG_DIR: Path = Path(__file__).resolve().parent.parent.parent / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-
 MAIL_LOG: Path = LOG_DIR / "emails.log"        # <── NEW (one line per recipient)
 
 
@@ -42,12 +48,14 @@ def _log_mail(to_addr: str | Sequence[str], subject: str) -> None:
     """
     subject = subject.replace("\n", " ").replace("\r", " ").strip()
     ts = datetime.utcnow().isoformat(timespec="milliseconds")
-    recipients: Iterable[str] = (
+    recipients: Sequence[str] = (
         to_addr if isinstance(to_addr, (list, tuple)) else [to_addr]
     )
+    MAIL_LOG.parent.mkdir(parents=True, exist_ok=True)
     with MAIL_LOG.open("a", encoding="utf-8") as f:
         for rcpt in recipients:
             f.write(f"{ts}  {rcpt}  {subject}\n")
+    stats.record_mails(len(recipients))
 
 
 # ────────────────────────────────────────────────────────────────
@@ -74,6 +82,28 @@ def _smtp_send(msg: EmailMessage, to_addr: str | Sequence[str]) -> None:
         print("❌  SMTP error:", exc)
 
 
+def _smtp_send_many(messages: Sequence[Tuple[EmailMessage, str]]) -> None:
+    """Like _smtp_send for several (msg, recipient) pairs over one SMTP session."""
+    if not messages:
+        return
+    if not EMAIL_USER or not EMAIL_PASS:
+        print("⚠︎  EMAIL_USER / EMAIL_PASS not configured – skip real send.")
+        for msg, to_addr in messages:
+            _log_mail(to_addr, msg["Subject"])
+        return
+
+    try:
+        with smtplib.SMTP(EMAIL_HOST, EMAIL_PORT, timeout=30) as smtp:
+            smtp.starttls()
+            smtp.login(EMAIL_USER, EMAIL_PASS)
+            for msg, to_addr in messages:
+                smtp.send_message(msg)
+                _log_mail(to_addr, msg["Subject"])
+        print(f"📧  {len(messages)} mails sent")
+    except Exception as exc:
+        print("❌  SMTP error:", exc)
+
+
 # ────────────────────────────────────────────────────────────────
 #  (1)  2-FA CODE
 # ────────────────────────────────────────────────────────────────
@@ -113,22 +143,15 @@ def _make_reminder_body(
 ) -> Tuple[str, str]:
     """Return (subject, body) prepared from email_templates.py."""
     tpl_group = TEMPLATES.get(reminder_type, {})
-    tpl = tpl_group.get(contract.contract_type, tpl_group.get("Default"))
+    tpl = tpl_group.get(contract.contract_type, tpl_group.get("default"))
     if not tpl:
         return "", ""
 
     # calendar date shown in e-mail
     if reminder_type == "payment":
-        due = contract.start_date
-        step = (
-            relativedelta(months=1)
-            if contract.payment_interval.lower() == "monthly"
-            else relativedelta(years=1)
-            if contract.payment_interval.lower() == "yearly"
-            else None
-        )
-        while step and due < datetime.utcnow():
-            due += step
+        due = recurrence.next_occurrence(
+            contract.start_date, contract.payment_interval, datetime.utcnow()
+        ) or contract.start_date
         date_str = due.date().isoformat()
     else:
         date_str = contract.end_date.date().isoformat()
@@ -154,13 +177,19 @@ def send_reminder_email(
     user: User | None = session.get(User, contract.user_id) if contract else None
     session.close()
 
-    if not contract or not user or not user.email_reminders_enabled:
+    if not contract or not user or not user.email_reminders_enabled or contract.status != "active":
+        return
+    if user.reminder_digest:                   # covered by the daily digest
         return
 
     subj, body = _make_reminder_body(contract, reminder_type, days_before)
     if not subj:
         return
 
+    _smtp_send(_reminder_message(to_address, subj, body), to_address)
+
+
+def _reminder_message(to_address: str, subj: str, body: str) -> EmailMessage:
     msg = EmailMessage()
     msg["Subject"] = subj
     msg["From"] = EMAIL_USER or "planpago@example.com"
@@ -187,8 +216,85 @@ def send_reminder_email(
     body = body.replace("Best regards,\nYour PlanPago Team", "").strip()
     msg.set_content(body)
     msg.add_alternative(html_body, subtype="html")
+    return msg
+
+
+# ────────────────────────────────────────────────────────────────
+#  (2b)  DAILY DIGEST  (User.reminder_digest)
+# ────────────────────────────────────────────────────────────────
+def _local_day(ts: datetime) -> date:
+    """Calendar day in REMINDER_TZ of a stored (naive UTC) timestamp."""
+    return ts.replace(tzinfo=timezone.utc).astimezone(REMINDER_TZ).date()
 
-    _smtp_send(msg, to_address)
+
+def _utc_start(day: date) -> datetime:
+    """Start of *day* in REMINDER_TZ as naive UTC, comparable with stored columns."""
+    return datetime.combine(day, time.min, REMINDER_TZ).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _make_digest_body(items: Sequence[tuple], today: date) -> Tuple[str, str]:
+    """(subject, body) from TEMPLATES["digest"]; items = (kind, days, when, name, type, amount)."""
+    tpl = TEMPLATES["digest"]
+    lines = []
+    for kind, days, when, name, ctype, amount in items:
+        group = tpl[kind]
+        lines.append(group.get(ctype, group["default"]).format(
+            name=name, type=ctype, amount=amount, days=days, date=_local_day(when).isoformat()
+        ))
+    day = today.isoformat()
+    return (tpl["subject"].format(count=len(items), date=day),
+            tpl["body"].format(date=day, items="\n".join(lines)))
+
+
+def send_reminder_digests(today: date | None = None) -> int:
+    """
+    Daily leader job: one mail per digest user with every payment / end
+    reminder that would have fired today as a single job.  Users are read
+    in id batches; each batch is sent over one SMTP session.
+    """
+    today = today or datetime.now(REMINDER_TZ).date()
+    # local (Berlin) day boundaries → UTC, the stored dates are naive UTC
+    lo = _utc_start(today + timedelta(days=min(REMINDER_DAYS)))
+    hi = _utc_start(today + timedelta(days=max(REMINDER_DAYS) + 1))
+    session = SessionLocal()
+    sent, last_uid = 0, 0
+    try:
+        while True:
+            users = dict(session.execute(
+                select(User.id, User.email)
+                .where(User.id > last_uid, User.reminder_digest.is_(True),
+                       User.email_reminders_enabled.is_(True))
+                .order_by(User.id).limit(DIGEST_BATCH)
+            ).all())
+            if not users:
+                break
+            last_uid = max(users)
+            items: Dict[int, list] = {}
+            for uid, name, ctype, amount, due, end in session.execute(
+                select(Contract.user_id, Contract.name, Contract.contract_type,
+                       Contract.amount, Contract.next_due_date, Contract.end_date)
+                .where(Contract.user_id.in_(users), Contract.status == "active",
+                       or_(and_(Contract.next_due_date >= lo, Contract.next_due_date < hi),
+                           and_(Contract.end_date >= lo, Contract.end_date < hi)))
+                .order_by(Contract.user_id, Contract.next_due_date)
+            ):
+                for kind, when in (("payment", due), ("end", end)):
+                    days = (_local_day(when) - today).days if when is not None else None
+                    if days in REMINDER_DAYS:
+                        items.setdefault(uid, []).append((kind, days, when, name, ctype, amount))
+            session.commit()                     # no open read while talking SMTP
+
+            messages = []
+            for uid, its in items.items():
+                its.sort(key=lambda i: (i[1], i[2]))
+                subj, body = _make_digest_body(its, today)
+                messages.append((_reminder_message(users[uid], subj, body), users[uid]))
+            _smtp_send_many(messages)
+            sent += len(messages)
+    finally:
+        session.close()
+    metrics.incr("reminders.digests", sent)
+    return sent
 
 
 # ────────────────────────────────────────────────────────────────
@@ -293,54 +399,129 @@ def send_individual_email(to_address: str, subject: str, body: str, attachments:
 # ────────────────────────────────────────────────────────────────
 #  (4)  APSCHEDULER ENTRY POINT
 # ────────────────────────────────────────────────────────────────
-def schedule_all_reminders(contract: Contract, scheduler, replace: bool = False) -> None:
+# Index of the reminder jobs per scheduler: contract id → {job id: (run_date, args)}.
+# Lookups, removals and the "nothing changed" check cost O(jobs of one
+# contract) instead of a scan over scheduler.get_jobs().  Fired date jobs
+# stay in the index until the contract is rescheduled; removing them again
+# is a harmless JobLookupError.  Callers serialise access (leader._lock).
+_index: "WeakKeyDictionary[object, Dict[int, Dict[str, tuple]]]" = WeakKeyDictionary()
+
+
+def _jobs_of(scheduler) -> Dict[int, Dict[str, tuple]]:
+    jobs = _index.get(scheduler)
+    if jobs is None:
+        jobs = _index[scheduler] = {}
+    return jobs
+
+
+def reminder_jobs(
+    contract_id: int,
+    email: str,
+    start_date: datetime,
+    end_date: datetime | None,
+    payment_interval: str,
+) -> Dict[str, tuple]:
+    """The reminder jobs a contract should have: {job id: (run_date, args)}."""
+    due = recurrence.next_occurrence(
+        start_date, payment_interval, datetime.utcnow(), end_date
+    )
+    jobs = {}
+    for days in REMINDER_DAYS:
+        # ─── payment ───────────────────────────────────────────
+        if due:
+            run_date = (due - timedelta(days=days)).replace(
+                hour=3, minute=0, second=0, microsecond=0
+            )
+            jobs[f"rem_{contract_id}_pay_{days}"] = (
+                run_date, (email, contract_id, days, "payment"))
+
+        # ─── contract end ──────────────────────────────────────
+        if end_date:
+            end_run = (end_date - timedelta(days=days)).replace(
+                hour=3, minute=0, second=0, microsecond=0
+            )
+            jobs[f"rem_{contract_id}_end_{days}"] = (
+                end_run, (email, contract_id, days, "end"))
+    return jobs
+
+
+def schedule_all_reminders(contract: Contract, scheduler) -> bool:
     """
     Schedule (3 d & 1 d) reminders for payment AND (optional) end of contract.
     """
-    if replace:
-        for job in scheduler.get_jobs():
-            if job.id.startswith(f"rem_{contract.id}_"):
-                scheduler.remove_job(job.id)
+    return schedule_reminders(
+        contract.id, contract.user.email, contract.start_date,
+        contract.end_date, contract.payment_interval, scheduler,
+        enabled=(contract.status == "active" and contract.user.email_reminders_enabled
+                 and not contract.user.reminder_digest),
+    )
 
-    from datetime import datetime  # local import to avoid circular ref
 
-    for days in (3, 1):
-        # ─── payment ───────────────────────────────────────────
-        due = contract.start_date
-        step = (
-            relativedelta(months=1)
-            if contract.payment_interval.lower() == "monthly"
-            else relativedelta(years=1)
-            if contract.payment_interval.lower() == "yearly"
-            else None
-        )
-        while step and due < datetime.utcnow():
-            due += step
-        run_date = (due - timedelta(days=days)).replace(
-            hour=3, minute=0, second=0, microsecond=0
-        )
+def schedule_reminders(
+    contract_id: int,
+    email: str,
+    start_date: datetime,
+    end_date: datetime | None,
+    payment_interval: str,
+    scheduler,
+    enabled: bool = True,
+) -> bool:
+    """
+    Same as schedule_all_reminders, from plain column values (bulk writes).
+    Only jobs whose run date or recipient differ are touched; returns False
+    if the contract's jobs were already up to date.  *enabled* = False
+    (inactive contract, reminders switched off) drops its jobs.
+    """
+    index = _jobs_of(scheduler)
+    want = reminder_jobs(contract_id, email, start_date, end_date, payment_interval) if enabled else {}
+    have = index.get(contract_id, {})
+    if want == have:
+        return False
+
+    for job_id in have.keys() - want.keys():
+        try:
+            scheduler.remove_job(job_id)
+        except JobLookupError:
+            pass
+    for job_id, (run_date, args) in want.items():
+        if have.get(job_id) == (run_date, args):
+            continue
         scheduler.add_job(
             send_reminder_email,
             trigger="date",
-            id=f"rem_{contract.id}_pay_{days}",
+            id=job_id,
             run_date=run_date,
-            args=[contract.user.email, contract.id, days, "payment"],
+            args=list(args),
             timezone="Europe/Berlin",
+            replace_existing=True,
         )
+    if want:
+        index[contract_id] = want
+    else:
+        index.pop(contract_id, None)
+    return True
+
+
+def remove_reminders(contract_ids: Iterable[int], scheduler) -> None:
+    """Drop all reminder jobs of the given contracts (index lookup per id)."""
+    index = _jobs_of(scheduler)
+    for cid in contract_ids:
+        for job_id in index.pop(cid, ()):
+            try:
+                scheduler.remove_job(job_id)
+            except JobLookupError:
+                pass
+
+
+def clear_reminders(scheduler) -> None:
+    """Drop every reminder job of *scheduler* (leadership lost)."""
+    remove_reminders(list(_jobs_of(scheduler)), scheduler)
+
+
+def reminder_count(scheduler) -> int:
+    """Contracts with reminder jobs in *scheduler*."""
+    return len(_jobs_of(scheduler))
 
-        # ─── contract end ──────────────────────────────────────
-        if contract.end_date:
-            end_run = (contract.end_date - timedelta(days=days)).replace(
-                hour=3, minute=0, second=0, microsecond=0
-            )
-            scheduler.add_job(
-                send_reminder_email,
-                trigger="date",
-                id=f"rem_{contract.id}_end_{days}",
-                run_date=end_run,
-                args=[contract.user.email, contract.id, days, "end"],
-                timezone="Europe/Berlin",
-            )
 
 def send_admin_impersonation_request_email(to_address: str, admin_email: str, confirm_url: str) -> None:
     display_admin = "Administrator" if admin_email == "admin@admin" else admin_email
@@ -0,0 +1,399 @@
+# backend/app/utils/events.py
+"""
+Per-user push events for the SSE stream (routes/events.py).
+
+publish() is called from sync code – route handlers in the threadpool,
+session commit hooks, scheduler jobs – and hands the event to the backend.
+Every worker delivers events to its own subscribers (the SSE generators on
+the event loop), woken with ``call_soon_threadsafe``.
+
+Backends (EVENTS_BACKEND):
+  sqlite  default – all workers on one host append to a separate database
+          file (EVENTS_PATH, last EVENT_STREAM_LEN rows kept); a reader
+          thread per worker polls it every EVENT_POLL seconds and delivers
+          new rows locally, resume reads the table
+  redis   the same across hosts with one Redis stream (REDIS_URL, needs
+          the ``redis`` package)
+  memory  events stay in this process – only for a single worker; the
+          last EVENT_BUFFER events per user are kept for resume
+
+Event ids look like Redis stream ids ("<ms>-<n>") and compare as (int, int);
+the sqlite backend uses "<file epoch>-<row id>".
+If a resume id is unknown or too old, replay() returns None and the stream
+sends "resync" – the client refetches instead of trusting a gap.
+
+Event types:
+  changed        {"version": n}  contracts/files written → GET /contracts/changes?since=
+  impersonation  {"request_id", "user_id", "confirmed"}  (to the requesting admin)
+  resync         {}              events were missed
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+BACKEND    = os.getenv("EVENTS_BACKEND", "sqlite").lower()
+BUFFER     = int(os.getenv("EVENT_BUFFER", "256"))          # per user (memory)
+USERS      = int(os.getenv("EVENT_USERS", "10000"))         # buffered users (memory)
+STREAM_LEN = int(os.getenv("EVENT_STREAM_LEN", "10000"))    # redis MAXLEN / sqlite rows kept
+PATH       = os.getenv("EVENTS_PATH", "./events.db")        # sqlite only
+POLL       = float(os.getenv("EVENT_POLL", "0.5"))          # sqlite reader interval (s)
+PRUNE_EVERY = 256                                           # sqlite: trim every n publishes
+QUEUE_SIZE = 256                                            # per subscriber
+REDIS_URL  = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class Event(NamedTuple):
+    id: str
+    user_id: int
+    type: str
+    data: dict
+
+
+def parse_id(event_id: Optional[str]) -> Optional[Tuple[int, int]]:
+    try:
+        ms, n = str(event_id).split("-", 1)
+        return int(ms), int(n)
+    except (TypeError, ValueError):
+        return None
+
+
+def frame(event: Event) -> bytes:
+    """SSE wire format."""
+    return (f"id: {event.id}\nevent: {event.type}\n"
+            f"data: {json.dumps(event.data, separators=(',', ':'))}\n\n").encode()
+
+
+# ───────── Subscribers (this process) ────────────────────────────
+class Subscription:
+    """Queue of one SSE connection; push() may be called from any thread."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.overflow = False            # events were dropped → client must resync
+        self._loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def push(self, event: Event) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:             # loop already closed
+            pass
+
+    def _put(self, event: Event) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflow = True
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+_subs: Dict[int, Set[Subscription]] = {}
+_subs_lock = threading.Lock()
+
+
+def _deliver(event: Event) -> None:
+    with _subs_lock:
+        targets = list(_subs.get(event.user_id, ()))
+    for sub in targets:
+        sub.push(event)
+    metrics.incr("events.delivered")
+
+
+# ───────── Backends ──────────────────────────────────────────────
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, buffer: int, users: int):
+        self.buffer, self.users = buffer, users
+        self._epoch = int(time.time() * 1000)
+        self._seq = itertools.count(1)
+        self._last = (self._epoch, 0)
+        # user id → [events, floor]; floor = newest id that may have been lost
+        self._log: "OrderedDict[int, list]" = OrderedDict()
+        self._floor_all = (self._epoch, 0)
+        self._lock = threading.Lock()
+
+    def publish(self, user_id: int, type: str, data: dict) -> None:
+        with self._lock:
+            key = (self._epoch, next(self._seq))
+            event = Event(f"{key[0]}-{key[1]}", user_id, type, data)
+            self._last = key
+            entry = self._log.get(user_id)
+            if entry is None:
+                entry = self._log[user_id] = [deque(), self._floor_all]
+                if len(self._log) > self.users:
+                    _, (events, floor) = self._log.popitem(last=False)
+                    newest = parse_id(events[-1].id) if events else floor
+                    self._floor_all = max(self._floor_all, newest)
+            else:
+                self._log.move_to_end(user_id)
+            events = entry[0]
+            if len(events) >= self.buffer:
+                entry[1] = parse_id(events.popleft().id)
+            events.append(event)
+        _deliver(event)
+
+    def replay(self, user_id: int, after: Tuple[int, int]) -> Optional[List[Event]]:
+        with self._lock:
+            if after[0] != self._epoch or after > self._last:
+                return None                                  # from before a restart
+            entry = self._log.get(user_id)
+            floor = entry[1] if entry else self._floor_all
+            if after < floor:
+                return None
+            return [e for e in (entry[0] if entry else ()) if parse_id(e.id) > after]
+
+    def head(self) -> str:
+        return f"{self._last[0]}-{self._last[1]}"
+
+    def start(self) -> None:
+        pass
+
+    def info(self) -> dict:
+        return {"buffered_users": len(self._log)}
+
+
+class SqliteBackend:
+    name = "sqlite"
+
+    def __init__(self, path: str, keep: int, poll: float):
+        self.path, self.keep, self.poll = path, keep, poll
+        self._conn: Optional[sqlite3.Connection] = None     # opened on first use, not on import
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()                      # own publishes are delivered at once
+        self._reader: Optional[threading.Thread] = None
+        self._publishes = 0
+
+    def _db(self) -> sqlite3.Connection:
+        """Shared connection (call with self._lock held)."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,"
+                " type TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_events_user ON events (user_id, id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            # ids of a recreated file must not resume against an older one
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('epoch', ?)",
+                         (str(int(time.time() * 1000)),))
+            self._epoch = int(conn.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0])
+            self._conn = conn
+        return self._conn
+
+    def _event(self, row) -> Event:
+        rid, user_id, type, data = row
+        return Event(f"{self._epoch}-{rid}", user_id, type, json.loads(data))
+
+    def publish(self, user_id: int, type: str, data: dict) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT INTO events (user_id, type, data) VALUES (?, ?, ?)",
+                       (user_id, type, json.dumps(data, separators=(",", ":"))))
+            self._publishes += 1
+            if self._publishes % PRUNE_EVERY == 0:
+                db.execute("DELETE FROM events WHERE id <= (SELECT max(id) FROM events) - ?",
+                           (self.keep,))
+        self._wake.set()
+
+    def replay(self, user_id: int, after: Tuple[int, int]) -> Optional[List[Event]]:
+        with self._lock:
+            db = self._db()
+            first, last = db.execute("SELECT min(id), max(id) FROM events").fetchone()
+            if after[0] != self._epoch or after[1] > (last or 0):
+                return None                                  # other file or unknown id
+            if first is not None and first > after[1] + 1:
+                return None                                  # trimmed past the resume point
+            rows = db.execute(
+                "SELECT id, user_id, type, data FROM events WHERE user_id = ? AND id > ?"
+                " ORDER BY id", (user_id, after[1]),
+            ).fetchall()
+        return [self._event(r) for r in rows]
+
+    def head(self) -> str:
+        with self._lock:
+            last = self._db().execute("SELECT max(id) FROM events").fetchone()[0]
+        return f"{self._epoch}-{last or 0}"
+
+    def start(self) -> None:
+        with self._lock:
+            if self._reader is None:
+                last = self._db().execute("SELECT max(id) FROM events").fetchone()[0] or 0
+                self._reader = threading.Thread(target=self._read, args=(last,),
+                                                name="events-reader", daemon=True)
+                self._reader.start()
+
+    def _read(self, last: int) -> None:
+        while True:
+            self._wake.wait(self.poll)
+            self._wake.clear()
+            try:
+                with self._lock:
+                    rows = self._db().execute(
+                        "SELECT id, user_id, type, data FROM events WHERE id > ?"
+                        " ORDER BY id LIMIT 1000", (last,),
+                    ).fetchall()
+                for row in rows:
+                    last = row[0]
+                    _deliver(self._event(row))
+                if len(rows) == 1000:
+                    self._wake.set()                         # more waiting
+            except Exception as exc:
+                log.warning("Event table read failed: %s", exc)
+                time.sleep(1)
+
+    def info(self) -> dict:
+        with self._lock:
+            first, last = self._db().execute("SELECT min(id), max(id) FROM events").fetchone()
+        return {"stored_events": (last - first + 1) if last else 0}
+
+
+class RedisBackend:
+    name = "redis"
+    STREAM = "planpago:events"
+
+    def __init__(self, url: str, maxlen: int):
+        import redis                                     # optional dependency
+        self._r = redis.Redis.from_url(url, decode_responses=True)
+        self.maxlen = maxlen
+        self._reader: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _event(entry_id: str, fields: dict) -> Event:
+        return Event(entry_id, int(fields["u"]), fields["t"], json.loads(fields["d"]))
+
+    def publish(self, user_id: int, type: str, data: dict) -> None:
+        self._r.xadd(self.STREAM, {"u": user_id, "t": type, "d": json.dumps(data)},
+                     maxlen=self.maxlen, approximate=True)
+
+    def replay(self, user_id: int, after: Tuple[int, int]) -> Optional[List[Event]]:
+        first = self._r.xrange(self.STREAM, count=1)
+        if not first or parse_id(first[0][0]) > after:
+            return None                                  # trimmed past the resume point
+        return [e for e in (self._event(i, f) for i, f in
+                            self._r.xrange(self.STREAM, min=f"({after[0]}-{after[1]}"))
+                if e.user_id == user_id]
+
+    def head(self) -> str:
+        last = self._r.xrevrange(self.STREAM, count=1)
+        return last[0][0] if last else "0-0"
+
+    def start(self) -> None:
+        with self._lock:
+            if self._reader is None:
+                self._reader = threading.Thread(target=self._read, name="events-reader", daemon=True)
+                self._reader.start()
+
+    def _read(self) -> None:
+        last = "$"
+        while True:
+            try:
+                for _, entries in self._r.xread({self.STREAM: last}, block=5000) or ():
+                    for entry_id, fields in entries:
+                        last = entry_id
+                        _deliver(self._event(entry_id, fields))
+            except Exception as exc:                     # connection lost → retry
+                log.warning("Event stream read failed: %s", exc)
+                time.sleep(1)
+
+    def info(self) -> dict:
+        return {"stream_length": self._r.xlen(self.STREAM)}
+
+
+def _make_backend():
+    if BACKEND == "memory":
+        return MemoryBackend(BUFFER, USERS)
+    if BACKEND == "redis":
+        try:
+            return RedisBackend(REDIS_URL, STREAM_LEN)
+        except Exception as exc:
+            log.warning("Events backend %r unavailable (%s) – using sqlite", BACKEND, exc)
+    return SqliteBackend(PATH, STREAM_LEN, POLL)
+
+
+_backend = _make_backend()
+
+
+# ───────── API ───────────────────────────────────────────────────
+def publish(user_id: int, type: str, data: dict) -> None:
+    try:
+        _backend.publish(user_id, type, data)
+    except Exception as exc:                             # never fail the write itself
+        log.warning("Event publish failed: %s", exc)
+
+
+def subscribe(user_id: int) -> Subscription:
+    """Register a subscription; call from the event loop."""
+    _backend.start()
+    sub = Subscription(user_id)
+    with _subs_lock:
+        _subs.setdefault(user_id, set()).add(sub)
+    return sub
+
+
+def unsubscribe(sub: Subscription) -> None:
+    with _subs_lock:
+        subs = _subs.get(sub.user_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del _subs[sub.user_id]
+
+
+def replay(user_id: int, last_event_id: str) -> Optional[List[Event]]:
+    """Events for *user_id* after *last_event_id*, None if some may be missing."""
+    after = parse_id(last_event_id)
+    if after is None:
+        return None
+    try:
+        return _backend.replay(user_id, after)
+    except Exception as exc:
+        log.warning("Event replay failed: %s", exc)
+        return None
+
+
+def resync(user_id: int) -> Event:
+    """A "resync" event carrying the current head id, so the next resume starts there."""
+    try:
+        head = _backend.head()
+    except Exception:
+        head = "0-0"
+    return Event(head, user_id, "resync", {})
+
+
+def info() -> dict:
+    """Backend and connection counts for the admin health view."""
+    with _subs_lock:
+        out = {"backend": _backend.name,
+               "users": len(_subs),
+               "connections": sum(len(s) for s in _subs.values())}
+    try:
+        out.update(_backend.info())
+    except Exception:
+        pass
+    out["delivered"] = metrics.get("events.delivered")
+    return out
@@ -0,0 +1,75 @@
+# backend/app/utils/file_reaper.py
+"""
+Deferred removal of uploaded (encrypted) files.
+
+Routes that delete contracts or users only collect the stored
+``/files/<uid>`` paths and hand them over here.  A single daemon thread
+unlinks them after the response has been sent and retries failures
+(e.g. a file still held open by a running preview) with back-off.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Iterable
+
+from ..config import UPLOAD_DIR
+
+log = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY  = 2.0          # seconds, doubled after every failed attempt
+
+_queue: "queue.Queue[tuple[Path, int]]" = queue.Queue()
+_worker: threading.Thread | None = None
+_lock = threading.Lock()
+
+
+def path_for(file_path: str) -> Path:
+    """Map a DB value like ``/files/<uid>`` to its location on disk."""
+    return UPLOAD_DIR / file_path.split("/files/")[-1]
+
+
+def enqueue(file_paths: Iterable[str]) -> int:
+    """Schedule the given DB file paths for deletion, return how many."""
+    n = 0
+    for fp in file_paths:
+        if fp:
+            _queue.put((path_for(fp), 1))
+            n += 1
+    if n:
+        _ensure_worker()
+    return n
+
+
+def pending() -> int:
+    """Number of files still waiting in the queue (retries excluded)."""
+    return _queue.qsize()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="file-reaper", daemon=True)
+            _worker.start()
+
+
+def _run() -> None:
+    while True:
+        path, attempt = _queue.get()
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as exc:
+            if attempt < MAX_ATTEMPTS:
+                delay = RETRY_DELAY * 2 ** (attempt - 1)
+                log.warning("Could not delete %s (%s) – retry in %.0fs", path, exc, delay)
+                t = threading.Timer(delay, _queue.put, args=((path, attempt + 1),))
+                t.daemon = True
+                t.start()
+            else:
+                log.error("Giving up deleting %s after %d attempts: %s", path, attempt, exc)
+        finally:
+            _queue.task_done()
@@ -0,0 +1,111 @@
+# backend/app/utils/forecast.py
+"""
+Vectorised cash-flow forecast.
+
+Every contract is expanded into its payment schedule over a window of
+calendar months with NumPy array arithmetic – one (contracts × months)
+grid per chunk instead of a Python loop per occurrence.
+
+Schedule rules (same as utils/recurrence.py):
+  • monthly / yearly payments fall on the start day, clamped to the last
+    day of shorter months (31 Jan → 28/29 Feb → 31 Mar)
+  • anything else is a one-time payment on the start date
+  • no payments after ``end_date``
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Sequence
+
+import numpy as np
+
+from .recurrence import step_months
+
+CHUNK = 8192                                      # contracts per grid → bounded memory
+
+_NO_END = np.datetime64("9999-12-31", "D")
+
+
+def interval_codes(intervals: Sequence[str]) -> np.ndarray:
+    return np.fromiter(
+        (step_months(i) for i in intervals),
+        dtype=np.int64, count=len(intervals),
+    )
+
+
+def to_days(values: Sequence[datetime | date | None]) -> np.ndarray:
+    """datetime/date list → datetime64[D] array (None → NaT)."""
+    return np.array(values, dtype="datetime64[D]")
+
+
+def month_axis(first: date, months: int) -> np.ndarray:
+    return np.datetime64(first.replace(day=1), "M") + np.arange(months)
+
+
+def expand(
+    start: np.ndarray,        # datetime64[D]
+    end: np.ndarray,          # datetime64[D], NaT = open-ended
+    step: np.ndarray,         # months between payments, 0 = one-time
+    amount: np.ndarray,       # float
+    group: np.ndarray,        # int group code per contract (e.g. type)
+    n_groups: int,
+    first: date,
+    months: int,
+) -> np.ndarray:
+    """Return a (n_groups × months) array of payment sums per calendar month."""
+    axis      = month_axis(first, months)                          # (M,)
+    axis_days = axis.astype("datetime64[D]")
+    dim       = ((axis + 1).astype("datetime64[D]") - axis_days).astype(np.int64)
+
+    out = np.zeros((n_groups, months), dtype=np.float64)
+    end = np.where(np.isnat(end), _NO_END, end)
+
+    for lo in range(0, len(start), CHUNK):
+        s, e = start[lo:lo + CHUNK], end[lo:lo + CHUNK]
+        st, amt, grp = step[lo:lo + CHUNK], amount[lo:lo + CHUNK], group[lo:lo + CHUNK]
+
+        s_month = s.astype("datetime64[M]")
+        s_day   = (s - s_month.astype("datetime64[D]")).astype(np.int64)          # 0-based
+        offset  = (axis[None, :] - s_month[:, None]).astype(np.int64)            # months since start
+        due     = axis_days[None, :] + np.minimum(s_day[:, None], dim[None, :] - 1)
+
+        hit = (offset >= 0) & (due <= e[:, None])
+        st_ = st[:, None]
+        hit &= np.where(st_ > 0, offset % np.maximum(st_, 1) == 0, offset == 0)
+
+        values = hit * amt[:, None]
+        for g in np.unique(grp):
+            out[g] += values[grp == g].sum(axis=0)
+    return out
+
+
+def forecast(
+    rows: Sequence[tuple],
+    groups: Sequence[str],
+    first: date,
+    months: int,
+) -> dict:
+    """
+    *rows* are ``(start_date, end_date, amount, payment_interval, group_key)``
+    tuples; returns the month labels and one series per entry of *groups*.
+    """
+    labels = [str(m) for m in month_axis(first, months)]
+    if not rows:
+        return {"months": labels, "series": {g: [0.0] * months for g in groups}}
+
+    start, end, amount, interval, key = zip(*rows)
+    index = {g: i for i, g in enumerate(groups)}
+    grid = expand(
+        to_days(start),
+        to_days(end),
+        interval_codes(interval),
+        np.asarray(amount, dtype=np.float64),
+        np.fromiter((index[k] for k in key), dtype=np.int64, count=len(key)),
+        len(groups),
+        first,
+        months,
+    )
+    return {
+        "months": labels,
+        "series": {g: grid[i].round(2).tolist() for i, g in enumerate(groups)},
+    }
@@ -0,0 +1,97 @@
+# backend/app/utils/health.py
+"""
+Background health probes.
+
+``refresh`` is run by the scheduler every ``HEALTH_INTERVAL`` seconds and
+stores its results in a module-level snapshot.  Request handlers only read
+that snapshot, so a slow mail server never blocks a worker thread.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import smtplib
+import threading
+from datetime import datetime
+
+from sqlalchemy import text
+
+from ..config import UPLOAD_DIR
+from ..database import SessionLocal
+from ..logging_config import LOG_DIR
+from .email_utils import EMAIL_HOST, EMAIL_PORT
+
+HEALTH_INTERVAL = int(os.getenv("HEALTH_INTERVAL", "60"))   # seconds
+SMTP_TIMEOUT    = 5
+
+_lock = threading.Lock()
+_snapshot: dict = {}
+
+
+def probe_db() -> bool:
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+    finally:
+        session.close()
+
+
+def probe_smtp() -> bool:
+    try:
+        with smtplib.SMTP(EMAIL_HOST, EMAIL_PORT, timeout=SMTP_TIMEOUT) as s:
+            s.ehlo()
+        return True
+    except Exception:
+        return False
+
+
+def probe_disk() -> dict:
+    try:
+        usage = shutil.disk_usage(UPLOAD_DIR)
+        return {"total": usage.total, "free": usage.free, "used": usage.used}
+    except OSError:
+        return {"total": 0, "free": 0, "used": 0}
+
+
+def probe_log_dir() -> int:
+    """Total size of all files in the log directory (rotated logs included)."""
+    size = 0
+    try:
+        with os.scandir(LOG_DIR) as it:
+            for entry in it:
+                if entry.is_file():
+                    size += entry.stat().st_size
+    except OSError:
+        pass
+    return size
+
+
+def refresh(scheduler) -> dict:
+    """Run all probes and replace the cached snapshot."""
+    result = {
+        "db":             probe_db(),
+        "smtp":           probe_smtp(),
+        "scheduler":      bool(scheduler.running),
+        "scheduler_jobs": len(scheduler.get_jobs()),
+        "disk":           probe_disk(),
+        "log_bytes":      probe_log_dir(),
+        "checked_at":     datetime.utcnow().isoformat(timespec="seconds"),
+    }
+    global _snapshot
+    with _lock:
+        _snapshot = result
+    return result
+
+
+def snapshot() -> dict:
+    """Last probe results (empty dict until the first run has finished)."""
+    return _snapshot
+
+
+def ready() -> bool:
+    """Cheap readiness check for load balancers – never touches SMTP."""
+    snap = _snapshot
+    return bool(snap) and snap["db"] and snap["scheduler"]
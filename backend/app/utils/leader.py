@@ -0,0 +1,289 @@
+# backend/app/utils/leader.py
+"""
+One scheduler leader across worker processes (``uvicorn --workers N``).
+
+Every worker starts its BackgroundScheduler, but besides the per-worker
+health probes it only runs the election job.  Leadership is a lease row in
+the database (scheduler_lease): the holder renews it every LEASE_RENEW
+seconds, it expires after LEASE_TTL – if the leader dies another worker
+takes over within LEASE_TTL, on a clean shutdown release() hands it over
+at the next election tick.
+
+On promotion the leader adds the jobs registered with job() (nightly
+maintenance, stats reconcile …), the outbox drain and a one-off pass that
+schedules reminders for all contracts; on demotion they are removed again.
+
+Reminder changes go through sync_reminders(ids).  The leader applies them
+directly, followers (and the leader while its first pass is running) write
+the ids to reminder_outbox, drained every OUTBOX_POLL seconds.  Only ids
+are queued – the leader compares the jobs with the contract rows and only
+touches those that changed (see email_utils.schedule_reminders), so a
+deleted or inactive contract simply loses its reminders.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Tuple
+
+from apscheduler.jobstores.base import JobLookupError
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from ..database import SessionLocal
+from ..models import Contract, ReminderOutbox, SchedulerLease, User
+from .email_utils import clear_reminders, remove_reminders, reminder_count, schedule_reminders
+
+log = logging.getLogger(__name__)
+
+LEASE_NAME  = "scheduler"
+LEASE_TTL   = int(os.getenv("LEADER_LEASE_TTL", "30"))       # seconds
+LEASE_RENEW = int(os.getenv("LEADER_LEASE_RENEW", "10"))
+OUTBOX_POLL = int(os.getenv("REMINDER_OUTBOX_POLL", "2"))
+BATCH       = 1000
+
+HOLDER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+_scheduler = None
+_leader = False          # lease held
+_ready = False           # … and the first reminder pass is done
+_since: datetime | None = None
+_stopped = False         # released on shutdown – stay out of the election
+_jobs: List[Tuple[Callable, bool, dict]] = []
+_lock = threading.Lock()             # promotion/demotion vs. adding reminder jobs
+
+_OWN_JOBS = ("reminder_outbox", "reminders_full_pass")
+
+
+def job(func: Callable, run_now: bool = False, **kwargs) -> None:
+    """Register a leader-only job (``scheduler.add_job`` kwargs incl. ``id``)."""
+    _jobs[:] = [j for j in _jobs if j[2].get("id") != kwargs.get("id")]
+    _jobs.append((func, run_now, kwargs))
+
+
+def start(scheduler) -> None:
+    """Join the election; call after scheduler.start() (again after release())."""
+    global _scheduler, _stopped
+    _scheduler, _stopped = scheduler, False
+    scheduler.add_job(
+        _elect,
+        trigger="interval",
+        seconds=LEASE_RENEW,
+        id="leader_election",
+        next_run_time=datetime.now(scheduler.timezone),
+        max_instances=1,
+        replace_existing=True,
+    )
+
+
+def is_leader() -> bool:
+    return _leader
+
+
+def info() -> dict:
+    """Lease state for the admin health view."""
+    session = SessionLocal()
+    try:
+        lease = session.get(SchedulerLease, LEASE_NAME)
+        return {
+            "this_process": HOLDER,
+            "is_leader": _leader,
+            "ready": _ready,
+            "leader_since": _since,
+            "holder": lease.holder if lease else None,
+            "expires_at": lease.expires_at if lease else None,
+            "outbox": session.query(ReminderOutbox).count(),
+            "reminder_contracts": reminder_count(_scheduler) if _scheduler else 0,
+        }
+    finally:
+        session.close()
+
+
+# ───────── Election ──────────────────────────────────────────────
+def _try_lease(now: datetime) -> bool:
+    expires = now + timedelta(seconds=LEASE_TTL)
+    session = SessionLocal()
+    try:
+        taken = session.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == LEASE_NAME,
+                   or_(SchedulerLease.holder == HOLDER, SchedulerLease.expires_at < now))
+            .values(holder=HOLDER, expires_at=expires),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        if not taken and session.get(SchedulerLease, LEASE_NAME) is None:
+            session.add(SchedulerLease(name=LEASE_NAME, holder=HOLDER, expires_at=expires))
+            taken = 1
+        session.commit()
+        return bool(taken)
+    except IntegrityError:                   # another worker inserted the row first
+        session.rollback()
+        return False
+    finally:
+        session.close()
+
+
+def _elect() -> None:
+    if _stopped:
+        return
+    try:
+        held = _try_lease(datetime.utcnow())
+    except Exception as exc:                 # DB unreachable → don't risk two leaders
+        log.warning("Leader lease check failed: %s", exc)
+        held = False
+    if held and not _leader:
+        _promote()
+    elif not held and _leader:
+        _demote()
+
+
+def _promote() -> None:
+    global _leader, _since
+    with _lock:
+        _leader, _since = True, datetime.utcnow()
+        now = datetime.now(_scheduler.timezone)
+        for func, run_now, kwargs in _jobs:
+            _scheduler.add_job(func, replace_existing=True,
+                               **({"next_run_time": now} if run_now else {}), **kwargs)
+        _scheduler.add_job(_drain_outbox, trigger="interval", seconds=OUTBOX_POLL,
+                           id="reminder_outbox", max_instances=1, replace_existing=True)
+        # own job: a long pass must not delay the lease renewal
+        _scheduler.add_job(_schedule_all, id="reminders_full_pass", replace_existing=True)
+    log.info("Scheduler leadership acquired by %s", HOLDER)
+
+
+def _demote() -> None:
+    global _leader, _ready, _since
+    with _lock:
+        _leader = _ready = False
+        _since = None
+        for job_id in {kw.get("id") for _, _, kw in _jobs}.union(_OWN_JOBS):
+            try:
+                _scheduler.remove_job(job_id)
+            except JobLookupError:
+                pass
+        clear_reminders(_scheduler)
+    log.warning("Scheduler leadership lost by %s", HOLDER)
+
+
+def release() -> None:
+    """Let the lease expire now (clean shutdown) so a follower takes over quickly."""
+    global _stopped
+    _stopped = True
+    if not _leader:
+        return
+    _demote()
+    session = SessionLocal()
+    try:
+        session.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == LEASE_NAME, SchedulerLease.holder == HOLDER)
+            .values(expires_at=datetime.utcnow()),
+            execution_options={"synchronize_session": False},
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+# ───────── Reminders ─────────────────────────────────────────────
+_REMINDER_COLS = (Contract.id, User.email, Contract.start_date, Contract.end_date,
+                  Contract.payment_interval, Contract.status,
+                  User.email_reminders_enabled, User.reminder_digest)
+
+
+def _schedule(row) -> bool:
+    cid, email, start, end, interval, status, enabled, digest = row
+    # digest users get no per-contract jobs (email_utils.send_reminder_digests)
+    return schedule_reminders(cid, email, start, end, interval, _scheduler,
+                              enabled=status == "active" and enabled and not digest)
+
+
+def _apply(ids: List[int]) -> None:
+    """Bring reminder jobs of *ids* in line with the database (caller holds _lock)."""
+    session = SessionLocal()
+    try:
+        for i in range(0, len(ids), BATCH):
+            chunk = ids[i:i + BATCH]
+            found = set()
+            for row in session.execute(
+                select(*_REMINDER_COLS).join(User, User.id == Contract.user_id)
+                .where(Contract.id.in_(chunk))
+            ):
+                found.add(row[0])
+                _schedule(row)
+            remove_reminders(set(chunk) - found, _scheduler)      # deleted contracts
+    finally:
+        session.close()
+
+
+def _schedule_all() -> None:
+    """First pass after promotion (replaces the per-worker startup pass)."""
+    global _ready
+    session = SessionLocal()
+    done, last_id = 0, 0
+    try:
+        while True:
+            # short reads in id order – a long open read would block writers on SQLite
+            rows = session.execute(
+                select(*_REMINDER_COLS).join(User, User.id == Contract.user_id)
+                .where(Contract.id > last_id).order_by(Contract.id).limit(BATCH)
+            ).all()
+            session.commit()
+            if not rows:
+                break
+            with _lock:
+                if not _leader:
+                    return
+                for row in rows:
+                    _schedule(row)
+            done += len(rows)
+            last_id = rows[-1][0]
+    finally:
+        session.close()
+    with _lock:
+        _ready = _leader
+    log.info("Scheduled reminders for %d contracts", done)
+
+
+def _drain_outbox() -> None:
+    if not _ready:
+        return
+    session = SessionLocal()
+    try:
+        while True:
+            rows = session.execute(
+                select(ReminderOutbox.id, ReminderOutbox.contract_id)
+                .order_by(ReminderOutbox.id).limit(BATCH)
+            ).all()
+            if not rows:
+                break
+            with _lock:
+                if not _ready:
+                    break
+                _apply(sorted({cid for _, cid in rows}))
+            session.execute(delete(ReminderOutbox).where(ReminderOutbox.id <= rows[-1][0]))
+            session.commit()
+    finally:
+        session.close()
+
+
+def sync_reminders(contract_ids: Iterable[int]) -> None:
+    """Reminder jobs of these contracts must match the database again (after commit)."""
+    ids = sorted(set(contract_ids))
+    if not ids:
+        return
+    with _lock:
+        if _ready:
+            _apply(ids)
+            return
+    session = SessionLocal()
+    try:
+        session.execute(insert(ReminderOutbox), [{"contract_id": i} for i in ids])
+        session.commit()
+    finally:
+        session.close()
@@ -0,0 +1,135 @@
+# backend/app/utils/maintenance.py
+"""
+Scheduled maintenance jobs that keep stored, derived contract data current.
+
+roll_forward_due_dates   nightly – moves Contract.next_due_date past "now",
+                         backfills rows that have no derived values yet and
+                         resyncs their reminders
+expire_contracts         nightly – sets status "expired" on active contracts
+                         whose end_date has passed and drops their reminders
+prune_tombstones         nightly – drops delta-sync tombstones older than
+                         TOMBSTONE_DAYS and raises User.sync_floor, so
+                         clients with older cursors resync from scratch
+"""
+from __future__ import annotations
+
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, delete, func, or_, select, update
+
+from ..database import SessionLocal
+from ..models import Contract, Tombstone, User
+from . import leader, metrics, stats, versioning
+from .recurrence import derived_fields
+
+log = logging.getLogger(__name__)
+
+BATCH = 1000
+TOMBSTONE_DAYS = int(os.getenv("TOMBSTONE_DAYS", "90"))
+
+
+def roll_forward_due_dates(now: datetime | None = None) -> int:
+    """Recompute derived columns for contracts whose next_due_date has passed."""
+    now = now or datetime.utcnow()
+    session = SessionLocal()
+    done, last_id = 0, 0
+    try:
+        while True:
+            rows = session.execute(
+                select(Contract.id, Contract.start_date, Contract.end_date,
+                       Contract.amount, Contract.payment_interval, Contract.user_id)
+                .where(Contract.id > last_id,
+                       or_(Contract.next_due_date < now,
+                           Contract.monthly_equivalent.is_(None)))
+                .order_by(Contract.id)
+                .limit(BATCH)
+            ).all()
+            if not rows:
+                break
+            versions = versioning.bump(session, {row.user_id for row in rows})
+            session.execute(
+                update(Contract),
+                [{"id": cid, "change_seq": versions[uid],
+                  **derived_fields(start, end, amount, interval, now)}
+                 for cid, start, end, amount, interval, uid in rows],
+            )
+            session.commit()
+
+            leader.sync_reminders(cid for cid, *_ in rows)     # jobs follow the new due dates
+            done += len(rows)
+            last_id = rows[-1][0]
+    finally:
+        session.close()
+    if done:
+        log.info("Rolled forward next_due_date for %d contracts", done)
+    return done
+
+
+def expire_contracts(now: datetime | None = None) -> int:
+    """Flip active contracts past their end_date to "expired", BATCH rows per transaction."""
+    now = now or datetime.utcnow()
+    stale = (Contract.status == "active", Contract.end_date < now)   # ix_contracts_status_end
+    session = SessionLocal()
+    done = 0
+    try:
+        while True:
+            batch = session.execute(
+                select(Contract.id, Contract.user_id).where(*stale)
+                .order_by(Contract.id).limit(BATCH)
+            ).all()
+            if not batch:
+                break
+            versions = versioning.bump(session, {uid for _, uid in batch})
+            rows = session.execute(
+                update(Contract)
+                .where(Contract.id.in_([cid for cid, _ in batch]), *stale)
+                .values(status="expired",
+                        change_seq=case(versions, value=Contract.user_id))
+                .returning(Contract.id, Contract.contract_type),
+                execution_options={"synchronize_session": False},
+            ).all()
+            deltas: Counter = Counter()
+            for ctype, n in Counter(ctype for _, ctype in rows).items():
+                deltas.update(stats.contract_deltas(ctype, "active", -n))
+                deltas.update(stats.contract_deltas(ctype, "expired", n))
+            stats.bump(session, deltas)
+            session.commit()
+
+            leader.sync_reminders(cid for cid, _ in rows)      # inactive → jobs removed
+            done += len(rows)
+            if len(batch) < BATCH:
+                break
+    finally:
+        session.close()
+    metrics.incr("maintenance.expire_runs")
+    metrics.incr("maintenance.expired", done)
+    if done:
+        log.info("Expired %d contracts past their end date", done)
+    return done
+
+
+def prune_tombstones(now: datetime | None = None) -> int:
+    """Delete old tombstones; cursors at or below the pruned versions become void."""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=TOMBSTONE_DAYS)
+    session = SessionLocal()
+    try:
+        floors = session.execute(
+            select(Tombstone.user_id, func.max(Tombstone.change_seq))
+            .where(Tombstone.deleted_at < cutoff)
+            .group_by(Tombstone.user_id)
+        ).all()
+        if not floors:
+            return 0
+        session.execute(update(User), [{"id": uid, "sync_floor": seq} for uid, seq in floors])
+        done = session.execute(
+            delete(Tombstone).where(Tombstone.deleted_at < cutoff),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        session.commit()
+    finally:
+        session.close()
+    log.info("Pruned %d tombstones older than %d days", done, TOMBSTONE_DAYS)
+    return done
@@ -0,0 +1,34 @@
+# backend/app/utils/metrics.py
+"""
+In-process counters (cache hits, job runs …) for the admin health view.
+
+Unlike utils/stats.py nothing is persisted – values start at zero with
+every process and are per worker.
+"""
+from __future__ import annotations
+
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_counters: Counter = Counter()
+
+
+def incr(name: str, n: int = 1) -> None:
+    with _lock:
+        _counters[name] += n
+
+
+def get(name: str) -> int:
+    return _counters[name]
+
+
+def ratio(hits: str, misses: str) -> float | None:
+    """hits / (hits + misses), None before the first event."""
+    h, m = _counters[hits], _counters[misses]
+    return round(h / (h + m), 4) if h + m else None
+
+
+def snapshot() -> dict:
+    with _lock:
+        return dict(sorted(_counters.items()))
@@ -0,0 +1,253 @@
+# backend/app/utils/page_cache.py
+"""
+Cache for serialised contract list pages (read_contracts).
+
+Keys are ``<user id>:<epoch>.<data_version>:<normalised query>``
+(versioning.stamp).  Every contract or file write bumps the user's
+data_version (utils/versioning.py), so a page cached before the write can
+never be served again – on any worker, because the version is read from
+the database.  The random per-account epoch does the same when SQLite hands
+a deleted user's id to a new account.  ``invalidate`` / ``clear`` only free
+the memory of dead entries early; versioning.bump and account deletion
+call them.
+
+Backends (PAGE_CACHE_BACKEND):
+  memory   default – LRU per process, bounded by PAGE_CACHE_ENTRIES and
+           PAGE_CACHE_MAX_BYTES
+  sqlite   shared between workers on one host – a separate database file
+           (PAGE_CACHE_PATH), pruned to PAGE_CACHE_ENTRIES rows
+  redis    shared between hosts – REDIS_URL, entries expire after
+           PAGE_CACHE_TTL seconds (needs the ``redis`` package)
+  off      disabled
+
+Hits and misses are counted in utils/metrics.py.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+from urllib.parse import urlencode
+
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+BACKEND   = os.getenv("PAGE_CACHE_BACKEND", "memory").lower()
+ENTRIES   = int(os.getenv("PAGE_CACHE_ENTRIES", "2048"))
+MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+TTL       = int(os.getenv("PAGE_CACHE_TTL", "3600"))              # redis only
+PATH      = os.getenv("PAGE_CACHE_PATH", "./page_cache.db")       # sqlite only
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+PRUNE_EVERY = 64                   # sqlite: check the row count every n puts
+
+
+def make_key(user_id: int, version: str, params: dict) -> str:
+    """Stable key: None values dropped, names sorted, values stringified."""
+    norm = sorted((k, str(v)) for k, v in params.items() if v is not None)
+    return f"{user_id}:{version}:{urlencode(norm)}"
+
+
+# ───────── Backends ──────────────────────────────────────────────
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, entries: int, max_bytes: int):
+        self.entries, self.max_bytes = entries, max_bytes
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._data.get(key)
+            if body is not None:
+                self._data.move_to_end(key)
+            return body
+
+    def put(self, key: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._data[key] = body
+            self._bytes += len(body)
+            while len(self._data) > self.entries or self._bytes > self.max_bytes:
+                _, dropped = self._data.popitem(last=False)
+                self._bytes -= len(dropped)
+                metrics.incr("page_cache.evictions")
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        prefixes = tuple(f"{uid}:" for uid in user_ids)
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefixes)]:
+                self._bytes -= len(self._data.pop(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def info(self) -> dict:
+        return {"entries": len(self._data), "bytes": self._bytes}
+
+
+class SqliteBackend:
+    name = "sqlite"
+
+    def __init__(self, path: str, entries: int):
+        self.entries = entries
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")            # cache, losing it is fine
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS page_cache ("
+            " key TEXT PRIMARY KEY, user_id INTEGER NOT NULL,"
+            " body BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_page_cache_user ON page_cache (user_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_page_cache_stored ON page_cache (stored_at)")
+        self._lock = threading.Lock()
+        self._puts = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM page_cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, body: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_cache (key, user_id, body, stored_at) VALUES (?, ?, ?, ?)",
+                (key, int(key.split(":", 1)[0]), body, time.time()),
+            )
+            self._puts += 1
+            if self._puts % PRUNE_EVERY == 0:
+                cur = self._conn.execute(
+                    "DELETE FROM page_cache WHERE key IN (SELECT key FROM page_cache"
+                    " ORDER BY stored_at DESC LIMIT -1 OFFSET ?)", (self.entries,)
+                )
+                metrics.incr("page_cache.evictions", max(cur.rowcount, 0))
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        ids = list(user_ids)
+        with self._lock:
+            self._conn.executemany("DELETE FROM page_cache WHERE user_id = ?", [(i,) for i in ids])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM page_cache")
+
+    def info(self) -> dict:
+        with self._lock:
+            n, size = self._conn.execute(
+                "SELECT count(*), coalesce(sum(length(body)), 0) FROM page_cache"
+            ).fetchone()
+        return {"entries": n, "bytes": size}
+
+
+class RedisBackend:
+    name = "redis"
+    PREFIX = "planpago:page:"
+
+    def __init__(self, url: str, ttl: int):
+        import redis                                     # optional dependency
+        self._r = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._r.get(self.PREFIX + key)
+
+    def put(self, key: str, body: bytes) -> None:
+        self._r.set(self.PREFIX + key, body, ex=self.ttl)
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        for uid in user_ids:
+            keys = list(self._r.scan_iter(match=f"{self.PREFIX}{uid}:*", count=500))
+            if keys:
+                self._r.delete(*keys)
+
+    def clear(self) -> None:
+        keys = list(self._r.scan_iter(match=f"{self.PREFIX}*", count=500))
+        if keys:
+            self._r.delete(*keys)
+
+    def info(self) -> dict:
+        return {"entries": None, "bytes": None}
+
+
+def _make_backend():
+    try:
+        if BACKEND == "off":
+            return None
+        if BACKEND == "sqlite":
+            return SqliteBackend(PATH, ENTRIES)
+        if BACKEND == "redis":
+            return RedisBackend(REDIS_URL, TTL)
+    except Exception as exc:                             # missing package, bad path …
+        log.warning("Page cache backend %r unavailable (%s) – using memory", BACKEND, exc)
+    return MemoryBackend(ENTRIES, MAX_BYTES)
+
+
+_backend = _make_backend()
+
+
+# ───────── API ───────────────────────────────────────────────────
+def get(key: str) -> Optional[bytes]:
+    if _backend is None:
+        return None
+    try:
+        body = _backend.get(key)
+    except Exception as exc:                             # shared backend down → just miss
+        log.warning("Page cache get failed: %s", exc)
+        body = None
+    metrics.incr("page_cache.hits" if body is not None else "page_cache.misses")
+    return body
+
+
+def put(key: str, body: bytes) -> None:
+    if _backend is None:
+        return
+    try:
+        _backend.put(key, body)
+    except Exception as exc:
+        log.warning("Page cache put failed: %s", exc)
+
+
+def invalidate(user_ids: Iterable[int]) -> None:
+    if _backend is None:
+        return
+    try:
+        _backend.invalidate(user_ids)
+    except Exception as exc:
+        log.warning("Page cache invalidate failed: %s", exc)
+
+
+def clear() -> None:
+    if _backend is None:
+        return
+    try:
+        _backend.clear()
+    except Exception as exc:
+        log.warning("Page cache clear failed: %s", exc)
+
+
+def info() -> dict:
+    """Backend, size and hit ratio for the admin health view."""
+    out = {"backend": _backend.name if _backend else "off"}
+    if _backend is not None:
+        try:
+            out.update(_backend.info())
+        except Exception:
+            pass
+    out["hits"] = metrics.get("page_cache.hits")
+    out["misses"] = metrics.get("page_cache.misses")
+    out["hit_ratio"] = metrics.ratio("page_cache.hits", "page_cache.misses")
+    return out
@@ -0,0 +1,107 @@
+# backend/app/utils/recurrence.py
+"""
+Payment recurrence in closed form.
+
+Occurrence *k* of a contract is ``start_date + k * step`` months, with
+the day clamped to the end of shorter months.  Every occurrence is anchored
+on the start date, so 31 Jan → 28 Feb → 31 Mar (no drift to the 28th).
+Finding the next/previous occurrence is O(1) regardless of how long ago
+the contract started.
+
+Intervals: "monthly" (1), "yearly" (12), anything else is a one-time
+payment on the start date.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from dateutil.relativedelta import relativedelta
+
+STEP_MONTHS = {"monthly": 1, "yearly": 12}
+_TICK = timedelta(microseconds=1)
+
+
+def step_months(interval: str | None) -> int:
+    """Months between payments, 0 for one-time."""
+    return STEP_MONTHS.get((interval or "").lower(), 0)
+
+
+def nth(start: datetime, interval: str | None, k: int) -> datetime:
+    """The k-th occurrence (k = 0 is the start date)."""
+    return start + relativedelta(months=k * step_months(interval))
+
+
+def _index_at_or_after(start: datetime, step: int, t: datetime) -> int:
+    """Smallest k with nth(k) >= t (step > 0)."""
+    if t <= start:
+        return 0
+    k = ((t.year - start.year) * 12 + t.month - start.month) // step
+    if start + relativedelta(months=k * step) < t:
+        k += 1
+    return k
+
+
+def next_occurrence(
+    start: datetime, interval: str | None, after: datetime, end: datetime | None = None
+) -> Optional[datetime]:
+    """First occurrence on or after *after* (None if there is none up to *end*)."""
+    step = step_months(interval)
+    if step:
+        due = start + relativedelta(months=_index_at_or_after(start, step, after) * step)
+    else:
+        due = start if start >= after else None
+    if due is None or (end is not None and due > end):
+        return None
+    return due
+
+
+def previous_occurrence(
+    start: datetime, interval: str | None, before: datetime, end: datetime | None = None
+) -> Optional[datetime]:
+    """Last occurrence strictly before *before* (and not after *end*)."""
+    if start >= before:
+        return None
+    step = step_months(interval)
+    if not step:
+        return start if end is None or start <= end else None
+    k = _index_at_or_after(start, step, before) - 1
+    if end is not None and end < before:
+        k = min(k, _index_at_or_after(start, step, end + _TICK) - 1)
+    return start + relativedelta(months=k * step) if k >= 0 else None
+
+
+def monthly_equivalent(amount: float, interval: str | None) -> float:
+    """Amount normalised to one month (one-time payments → 0)."""
+    step = step_months(interval)
+    return amount / step if step else 0.0
+
+
+def derived_fields(
+    start: datetime, end: datetime | None, amount: float, interval: str | None,
+    now: datetime | None = None,
+) -> dict:
+    """Values for Contract.next_due_date / Contract.monthly_equivalent."""
+    return {
+        "next_due_date": next_occurrence(start, interval, now or datetime.utcnow(), end),
+        "monthly_equivalent": monthly_equivalent(amount, interval),
+    }
+
+
+def occurrences(
+    start: datetime, interval: str | None, lo: datetime, hi: datetime, end: datetime | None = None
+) -> List[datetime]:
+    """All occurrences in [lo, hi), cut off after *end*."""
+    if end is not None and end < hi:
+        hi = end + _TICK
+    step = step_months(interval)
+    if not step:
+        return [start] if lo <= start < hi else []
+    out = []
+    k = _index_at_or_after(start, step, lo)
+    while True:
+        due = start + relativedelta(months=k * step)
+        if due >= hi:
+            return out
+        out.append(due)
+        k += 1
@@ -0,0 +1,93 @@
+# backend/app/utils/serialization.py
+"""
+Fast JSON for contract list pages.
+
+The regular path loads ORM objects and validates every item through
+schemas.Contract before dumping it.  Here the list query selects only the
+schema's columns as plain tuples and they are encoded directly – with
+orjson if installed, otherwise with a precompiled pydantic TypeAdapter.
+Output is the same JSON as ``PaginatedContracts.model_dump_json()``.
+
+Sparse fieldsets (``fields=``): parse_fields turns the parameter into a
+schema-ordered tuple, columns() gives the attributes for load_only /
+with_entities and item_model/page_model the matching pydantic models for
+the regular path.  Lists leave out ``notes`` unless asked for.
+
+Facets (``facets=true``) are serialised separately and spliced into the
+finished page by with_facets, so both paths stay byte-identical.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import ConfigDict, TypeAdapter, create_model
+
+from .. import models, schemas
+
+try:
+    import orjson
+except ImportError:                                  # optional – fallback below
+    orjson = None
+
+CONTRACT_FIELDS = tuple(schemas.Contract.model_fields)          # schema order
+CONTRACT_COLUMNS = tuple(getattr(models.Contract, f) for f in CONTRACT_FIELDS)
+LIST_FIELDS = tuple(f for f in CONTRACT_FIELDS if f != "notes")     # notes deferred in lists
+
+_ANY = TypeAdapter(Dict[str, Any])
+
+
+def dumps(obj: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _ANY.dump_json(obj)
+
+
+def contract_page(rows: Iterable[Sequence], total: int,
+                  fields: Sequence[str] = CONTRACT_FIELDS) -> bytes:
+    """Rows selected as ``fields`` → PaginatedContracts JSON."""
+    return dumps({"items": [dict(zip(fields, r)) for r in rows], "total": total})
+
+
+def with_facets(page: bytes, facets: bytes) -> bytes:
+    """Append a ``"facets"`` member to a serialised page (either path)."""
+    return page[:-1] + b',"facets":' + facets + b"}"
+
+
+# ───────── Sparse fieldsets ──────────────────────────────────────
+def parse_fields(spec: Optional[str], default: Tuple[str, ...]) -> Tuple[str, ...]:
+    """``"name,amount"`` → ("name", "amount", "id") in schema order; "*" = all."""
+    if not spec or not spec.strip():
+        return default
+    if spec.strip() == "*":
+        return CONTRACT_FIELDS
+    wanted = {f.strip() for f in spec.split(",") if f.strip()}
+    unknown = wanted.difference(CONTRACT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    wanted.add("id")
+    return tuple(f for f in CONTRACT_FIELDS if f in wanted)
+
+
+def columns(fields: Sequence[str]) -> tuple:
+    return tuple(getattr(models.Contract, f) for f in fields)
+
+
+@lru_cache(maxsize=64)
+def item_model(fields: Tuple[str, ...]):
+    if fields == CONTRACT_FIELDS:
+        return schemas.Contract
+    src = schemas.Contract.model_fields
+    return create_model(
+        "ContractFields", __config__=ConfigDict(from_attributes=True),
+        **{f: (src[f].annotation, src[f]) for f in fields},
+    )
+
+
+@lru_cache(maxsize=64)
+def page_model(fields: Tuple[str, ...]):
+    if fields == CONTRACT_FIELDS:
+        return schemas.PaginatedContracts
+    return create_model(
+        "PaginatedContractFields", items=(List[item_model(fields)], ...), total=(int, ...)
+    )
@@ -0,0 +1,169 @@
+# backend/app/utils/stats.py
+"""
+System-wide counters for the admin panel.
+
+Write paths adjust the rows of ``system_stats`` inside their own
+transaction via ``bump``; ``reconcile`` recomputes everything from the base
+tables on an interval to correct drift.  Reading the stats is one select
+over a table of a few dozen rows, independent of the data size.
+
+Keys
+────
+users, contracts, files, stored_bytes
+contracts.type.<contract_type>, contracts.status.<status>
+mails.<YYYY-MM-DD>        one per day, trimmed to MAIL_DAYS_KEPT
+reminders.next_7d         reminder jobs due within a week, from the stored dates
+                          (reconcile only)
+reconciled_at             unix time of the last reconcile run
+"""
+from __future__ import annotations
+
+import os
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Mapping
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import Contract, ContractFile, SystemStat, User
+
+RECONCILE_HOURS = int(os.getenv("STATS_RECONCILE_HOURS", "6"))
+MAIL_DAYS_KEPT  = 90
+MAIL_DAYS_SHOWN = 30
+
+
+def contract_deltas(contract_type: str, status: str, n: int = 1) -> Counter:
+    """Counter changes for adding (n > 0) or removing (n < 0) contracts."""
+    return Counter({
+        "contracts": n,
+        f"contracts.type.{contract_type}": n,
+        f"contracts.status.{status}": n,
+    })
+
+
+def bump(db: Session, deltas: Mapping[str, int]) -> None:
+    """Apply *deltas* in the caller's transaction (no commit)."""
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        res = db.execute(
+            update(SystemStat)
+            .where(SystemStat.key == key)
+            .values(value=SystemStat.value + delta)
+        )
+        if res.rowcount == 0:
+            db.execute(insert(SystemStat).values(key=key, value=delta))
+
+
+def record_mails(n: int = 1) -> None:
+    """Count *n* outgoing mails for today (own short transaction)."""
+    session = SessionLocal()
+    try:
+        bump(session, {f"mails.{date.today().isoformat()}": n})
+        session.commit()
+    except Exception:
+        session.rollback()
+    finally:
+        session.close()
+
+
+def read(db: Session) -> dict:
+    """Current counters, shaped for the admin panel."""
+    raw = dict(db.execute(select(SystemStat.key, SystemStat.value)).all())
+    today = date.today()
+    mails = {}
+    for i in range(MAIL_DAYS_SHOWN - 1, -1, -1):
+        day = (today - timedelta(days=i)).isoformat()
+        mails[day] = raw.get(f"mails.{day}", 0)
+
+    def group(prefix: str) -> dict:
+        return {k[len(prefix):]: v for k, v in raw.items() if k.startswith(prefix) and v}
+
+    reconciled = raw.get("reconciled_at")
+    return {
+        "users":               raw.get("users", 0),
+        "contracts":           raw.get("contracts", 0),
+        "active_contracts":    raw.get("contracts.status.active", 0),
+        "contracts_by_type":   group("contracts.type."),
+        "contracts_by_status": group("contracts.status."),
+        "files":               raw.get("files", 0),
+        "stored_bytes":        raw.get("stored_bytes", 0),
+        "mails_per_day":       mails,
+        "upcoming_reminders":  raw.get("reminders.next_7d", 0),
+        "reconciled_at":       datetime.utcfromtimestamp(reconciled).isoformat() if reconciled else None,
+    }
+
+
+def _backfill_sizes(session: Session, batch: int = 1000) -> None:
+    """Fill ContractFile.size_bytes for files uploaded before it existed."""
+    from .file_reaper import path_for
+
+    rows = session.execute(
+        select(ContractFile.id, ContractFile.file_path)
+        .where(ContractFile.size_bytes.is_(None))
+        .limit(batch)
+    ).all()
+    for fid, fp in rows:
+        try:
+            size = path_for(fp).stat().st_size
+        except OSError:
+            size = 0
+        session.execute(
+            update(ContractFile).where(ContractFile.id == fid).values(size_bytes=size)
+        )
+
+
+def _reminders_next_7d(session: Session) -> int:
+    """
+    Reminder jobs (payment / end, REMINDER_DAYS before) running within a
+    week, from the stored dates – the same on every worker, no job scan.
+    """
+    from .email_utils import REMINDER_DAYS
+
+    now = datetime.utcnow()
+    week = timedelta(days=7)
+    jobs = [
+        case((col.between(now + timedelta(days=d), now + timedelta(days=d) + week), 1), else_=0)
+        for col in (Contract.next_due_date, Contract.end_date)
+        for d in REMINDER_DAYS
+    ]
+    return session.execute(
+        select(func.coalesce(func.sum(sum(jobs[1:], jobs[0])), 0))
+        .join(User, User.id == Contract.user_id)
+        .where(Contract.status == "active",
+               User.email_reminders_enabled.is_(True),
+               User.reminder_digest.is_not(True))             # digest users have no jobs
+    ).scalar_one()
+
+
+def reconcile() -> None:
+    """Recompute all DB-derived counters from scratch and trim old mail days."""
+    session = SessionLocal()
+    try:
+        _backfill_sizes(session)
+
+        values = Counter()
+        values["users"] = session.execute(select(func.count(User.id))).scalar_one()
+        for ctype, cstatus, n in session.execute(
+            select(Contract.contract_type, Contract.status, func.count())
+            .group_by(Contract.contract_type, Contract.status)
+        ):
+            values.update(contract_deltas(ctype, cstatus, n))
+        n_files, n_bytes = session.execute(
+            select(func.count(ContractFile.id), func.coalesce(func.sum(ContractFile.size_bytes), 0))
+        ).one()
+        values["files"], values["stored_bytes"] = n_files, n_bytes
+        values["reminders.next_7d"] = _reminders_next_7d(session)
+        values["reconciled_at"] = int(time.time())
+
+        cutoff = (date.today() - timedelta(days=MAIL_DAYS_KEPT)).isoformat()
+        session.execute(delete(SystemStat).where(SystemStat.key.not_like("mails.%")))
+        session.execute(delete(SystemStat).where(SystemStat.key < f"mails.{cutoff}",
+                                                 SystemStat.key.like("mails.%")))
+        session.execute(insert(SystemStat), [{"key": k, "value": v} for k, v in values.items()])
+        session.commit()
+    finally:
+        session.close()
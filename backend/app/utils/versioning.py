@@ -0,0 +1,111 @@
+# backend/app/utils/versioning.py
+"""
+Per-user data version and conditional GETs.
+
+Every write to a user's contracts or files bumps ``User.data_version`` in
+the same transaction.  Read endpoints derive a weak ETag from the user,
+its epoch and that version (stamp) and the request (path + query), so ``If-None-Match`` can be
+answered with 304 straight after authentication – the user row is already
+loaded by get_current_user, no contract is queried or serialised.
+
+    tag = versioning.etag(request, current_user)
+    if (hit := versioning.not_modified(request, tag)) is not None:
+        return hit
+    response.headers.update(versioning.headers(tag))
+
+The version doubles as the per-user change sequence for delta sync: writes
+stamp the rows they touch with the new version (``change_seq``) and record
+deletions as tombstones, so GET /contracts/changes?since=<version> only
+reads rows above the cursor through (user_id, change_seq) indexes.
+
+    seq = versioning.bump(db, [user.id])[user.id]
+    contract.change_seq = seq
+    versioning.tombstone(db, user.id, seq, contracts=[contract.id])
+
+Once the transaction commits, each bumped user gets a "changed" event with
+the new version on the SSE stream (utils/events.py).
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import Session
+
+from ..models import Tombstone, User
+from . import events, page_cache
+
+CACHE_CONTROL = "private, no-cache"        # browsers may store, but must revalidate
+
+
+def bump(db: Session, user_ids: Iterable[int]) -> Dict[int, int]:
+    """Increment data_version for the given users (caller commits) → {user id: new version}."""
+    ids = set(user_ids)
+    if not ids:
+        return {}
+    versions = db.execute(
+        update(User).where(User.id.in_(ids))
+        .values(data_version=User.data_version + 1)
+        .returning(User.id, User.data_version),
+        execution_options={"synchronize_session": False},
+    ).all()
+    page_cache.invalidate(ids)              # pages of the old version are dead anyway
+    versions = dict(versions)
+    db.info.setdefault("bumped", {}).update(versions)
+    return versions
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_bumps(session: Session) -> None:
+    for uid, version in session.info.pop("bumped", {}).items():
+        events.publish(uid, "changed", {"version": version})
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_bumps(session: Session) -> None:
+    session.info.pop("bumped", None)
+
+
+def tombstone(db: Session, user_id: int, seq: int,
+              contracts: Iterable[int] = (), files: Iterable[int] = ()) -> None:
+    """Record deleted contract / file ids at change sequence *seq* (caller commits)."""
+    rows = [{"user_id": user_id, "kind": "contract", "object_id": i, "change_seq": seq}
+            for i in contracts]
+    rows += [{"user_id": user_id, "kind": "file", "object_id": i, "change_seq": seq}
+             for i in files]
+    if rows:
+        db.execute(insert(Tombstone), rows)
+
+
+def stamp(user: User) -> str:
+    """``<epoch>.<data_version>`` – the user's data state; the random
+    User.cache_epoch keeps it unique when SQLite reuses a deleted user's id."""
+    return f"{user.cache_epoch or ''}.{user.data_version or 0}"
+
+
+def etag(request: Request, user: User) -> str:
+    """Weak ETag for *request* as seen by *user* at its current data version."""
+    params = "&".join(sorted(str(request.url.query).split("&")))
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{params}".encode(), digest_size=8
+    ).hexdigest()
+    return f'W/"{user.id}.{stamp(user)}.{digest}"'
+
+
+def headers(tag: str) -> dict:
+    return {"ETag": tag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(request: Request, tag: str) -> Optional[Response]:
+    """A 304 response if If-None-Match contains *tag* (weak comparison), else None."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    opaque = tag[2:]
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return Response(status_code=304, headers=headers(tag))
+    return None
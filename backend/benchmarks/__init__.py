@@ -0,0 +1 @@
+"""Benchmarks for the PlanPago backend (run from backend/: python -m benchmarks.<name>)."""
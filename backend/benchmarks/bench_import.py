@@ -0,0 +1,96 @@
+# backend/benchmarks/bench_import.py
+"""
+Import-time benchmark for ``app.main``.
+
+    python -m benchmarks.bench_import [--repeat 5] [--top 15]
+                                      [--budget-ms 0] [--out import.json]
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter
+(throw-away cwd, LOG_DIR / UPLOAD_DIR / ENCRYPTION_KEY_PATH pointing into
+it, so a stray database.db, log dir, upload dir or key would show up) and
+reports the median cumulative import time plus the slowest direct imports.
+It fails when the import touches the disk, pulls in one of the lazily
+loaded modules (HEAVY) or – with ``--budget-ms`` – takes longer than the
+budget.
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY   = ("reportlab", "pyotp", "PIL", "numpy")      # loaded on first use only
+DATA_DIRS = {"LOG_DIR": "logs", "UPLOAD_DIR": "uploaded_files",   # must not exist after import
+             "ENCRYPTION_KEY_PATH": "encryption.key"}
+LINE    = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_once(workdir: str) -> dict:
+    """{module: (self µs, cumulative µs, depth)} of one cold interpreter."""
+    env = dict(os.environ, PYTHONPATH=BACKEND, SECRET_KEY=os.getenv("SECRET_KEY", "benchmark"),
+               **{var: os.path.join(workdir, name) for var, name in DATA_DIRS.items()})
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=workdir, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode:
+        sys.exit(f"import failed:\n{proc.stderr[-2000:]}")
+    mods = {}
+    for m in LINE.finditer(proc.stderr):
+        mods[m.group(4)] = (int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2)
+    return mods
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--budget-ms", type=float, default=0, help="fail above this median (0 = off)")
+    ap.add_argument("--out", help="write the results as JSON")
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="planpago-import-")
+    import_once(workdir)                                   # warm-up: writes the .pyc files
+    runs, cumulative = [], defaultdict(list)
+    for _ in range(args.repeat):
+        mods = import_once(workdir)
+        runs.append(mods["app.main"][1] / 1000)
+        for name, (_, cum, _) in mods.items():
+            cumulative[name].append(cum / 1000)
+
+    errors = []
+    if os.listdir(workdir):
+        errors.append(f"import wrote to the working directory: {os.listdir(workdir)}")
+    heavy = sorted({n for n in mods if n.split(".")[0] in HEAVY})
+    if heavy:
+        errors.append(f"lazy modules imported eagerly: {', '.join(heavy[:10])}")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    median = statistics.median(runs)
+    print(f"→  import app.main: {median:.0f} ms median (min {min(runs):.0f}, {args.repeat} runs)")
+    # direct imports of app.main – together they make up its cumulative time
+    shown = sorted(((statistics.median(cumulative[n]), n) for n, (_, _, depth) in mods.items()
+                    if depth == 1), reverse=True)[:args.top]
+    for ms, name in shown:
+        print(f"   {name:<44}{ms:>9.1f} ms")
+
+    if args.budget_ms and median > args.budget_ms:
+        errors.append(f"median {median:.0f} ms above budget {args.budget_ms:.0f} ms")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"median_ms": round(median, 1), "min_ms": round(min(runs), 1),
+                       "modules": {n: round(ms, 1) for ms, n in shown}, "errors": errors},
+                      f, indent=2)
+    for e in errors:
+        print(f"✗  {e}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# backend/benchmarks/bench_serialization.py
+"""
+Contract list serialisation: regular ORM + pydantic path vs. the column
+tuple fast path (FAST_CONTRACT_LISTS).
+
+    python -m benchmarks.bench_serialization [--contracts 10000] [--pages 200]
+
+Seeds a throw-away database, checks that both paths produce the same bytes
+(orjson and the TypeAdapter fallback) and reports CPU time per page.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--contracts", type=int, default=10_000)
+    ap.add_argument("--pages", type=int, default=200)
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.chdir(tempfile.mkdtemp(prefix="planpago-ser-"))          # database.db is cwd-relative
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app import models, schemas
+    from app.database import Base, SessionLocal, engine
+    from app.utils import serialization
+    from .seed import seed_contracts, seed_users
+
+    Base.metadata.create_all(bind=engine)
+    uid = seed_users(engine, 1, prefix="ser")[0]
+    seed_contracts(engine, args.contracts, [uid], 1, date(2025, 1, 1), progress=False)
+    db = SessionLocal()
+    db.add(models.Contract(user_id=uid, name="Größe «test» ✓", contract_type="other",
+                           start_date=datetime(2031, 5, 17, 8, 30, 1, 250), amount=0.1 + 0.2,
+                           payment_interval="one-time", status=None, notes=None))
+    db.commit()
+
+    C = models.Contract
+    # id order: the page query is an index walk, so the timings show the row
+    # loading + serialisation work rather than SQLite sorting wide rows
+    query = db.query(C).filter(C.user_id == uid).order_by(C.id)
+    total = query.count()
+
+    def regular(skip, limit):
+        items = query.offset(skip).limit(limit).all()
+        body = schemas.PaginatedContracts.model_validate(
+            {"items": items, "total": total}).model_dump_json().encode()
+        db.expunge_all()                        # a request starts with an empty session
+        return body
+
+    def fast(skip, limit):
+        rows = query.offset(skip).limit(limit).with_entities(*serialization.CONTRACT_COLUMNS).all()
+        return serialization.contract_page(rows, total)
+
+    for skip in range(0, total, 500):
+        a, b = regular(skip, 100), fast(skip, 100)
+        assert a == b, (skip, a[:300], b[:300])
+        orjson, serialization.orjson = serialization.orjson, None
+        try:
+            assert fast(skip, 100) == a, ("TypeAdapter fallback", skip)
+        finally:
+            serialization.orjson = orjson
+    print(f"✓  identical output for {total:,} contracts "
+          f"({'orjson' if serialization.orjson else 'TypeAdapter'} + fallback)")
+
+    for limit in (20, 100):
+        skips = [(i * limit) % max(total - limit, 1) for i in range(args.pages)]
+        res = {}
+        for name, fn in (("regular", regular), ("fast", fast)):
+            t0 = time.process_time()
+            for skip in skips:
+                fn(skip, limit)
+            res[name] = (time.process_time() - t0) / args.pages * 1000
+        print(f"→  {limit:>3} items/page: regular {res['regular']:.2f} ms CPU, "
+              f"fast {res['fast']:.2f} ms CPU  ({res['regular'] / res['fast']:.1f}×)")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# backend/benchmarks/seed.py
+"""
+High-volume synthetic data seeder.
+
+    python -m benchmarks.seed [--users 1000] [--contracts 1000000] [--files 0]
+                              [--seed 1] [--anchor 2025-01-01] [--txn 200000]
+
+Writes straight into ./database.db (run it from backend/ or a staging copy)
+with large executemany transactions instead of going through the API:
+
+  • contracts follow ``script.fake_contract`` (start dates ten years back to
+    one year ahead of ``--anchor``), every row drawn on its own; the columns
+    – next_due_date / monthly_equivalent included – are generated with
+    numpy per chunk and already in their SQLite representation
+  • ids are assigned here, so files can reference contracts without
+    RETURNING and the same ``--seed``/``--anchor`` always give the same data
+  • each ``--txn`` chunk is one transaction, sorted by owner, written with
+    a large page cache and synchronous=OFF; into an empty contracts table
+    the secondary indexes are dropped and rebuilt once at the end
+  • users are seed<N>@example.com with the password ``planpago``
+  • ``--files`` encrypted dummy attachments go to UPLOAD_DIR
+
+Reminder jobs are not created; they are loaded on the next app start.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+POOL_BACK  = 3650                  # template start dates: days before the anchor …
+POOL_AHEAD = 365                   # … and after it
+TXN_ROWS   = 200_000               # rows per transaction
+BATCH_ROWS = 20_000                # rows per executemany
+CACHE_KB   = 512 * 1024            # page cache while seeding (random user_id index inserts)
+PASSWORD   = "planpago"
+FILE_BODY  = b"PlanPago demo attachment\n" * 80
+
+
+TEMPLATE_COLS = ("contract_type", "start_date", "end_date", "amount", "payment_interval",
+                 "status", "notes", "next_due_date", "monthly_equivalent")
+AMOUNTS = {                        # randint ranges of script.fake_contract
+    "rent": (600, 1400), "insurance": (20, 80), "streaming": (8, 20),
+    "salary": (1700, 3000), "leasing": (200, 600), "other": (15, 80),
+}
+NOTES      = "generated via bulk script"
+END_SHARE  = .6                    # contracts with an end date (one year after the start)
+SQL_TIME   = " 00:00:00.000000"    # SQLite DATETIME storage format, all dates at midnight
+
+
+def _add_months(month, day, k):
+    """start + k months with the day clamped, as in recurrence.nth (datetime64)."""
+    import numpy as np
+    m = month + k
+    last = ((m + 1).astype("datetime64[D]") - m.astype("datetime64[D]")).astype(int) - 1
+    return m.astype("datetime64[D]") + np.minimum(day, last)
+
+
+def _sql_dates(days, missing=None) -> list:
+    """datetime64[D] → the strings SQLite stores (None where *missing*)."""
+    import numpy as np
+    lo = days.min()                                # a few thousand distinct days:
+    span = np.arange(lo, days.max() + 1)           # format those, then look them up
+    table = np.char.add(np.datetime_as_string(span, unit="D"), SQL_TIME).astype(object)
+    out = table[(days - lo).astype(int)]
+    if missing is not None:
+        out[missing] = None
+    return out.tolist()
+
+
+def contract_columns(n: int, rng, anchor: date) -> list:
+    """
+    *n* contracts as one list per TEMPLATE_COLS column, drawn per row like
+    ``script.fake_contract`` (type, amount, interval, start date ten years
+    back to one year ahead of *anchor*, 60 % with an end date).
+    next_due_date / monthly_equivalent follow utils.recurrence, computed
+    column-wise; dates are already in SQLite's storage format.
+    """
+    import numpy as np
+    sys.path.insert(0, ROOT)
+    import script
+    from app.utils import recurrence
+
+    types = np.array(script.TYPES)
+    intervals = np.array(script.PAY_INT)
+    t = rng.integers(0, len(types), n)
+    lo, hi = np.array([AMOUNTS[x] for x in script.TYPES]).T
+    amount = rng.integers(lo[t], hi[t] + 1).astype(float)
+    iv = rng.integers(0, len(intervals), n)
+    step = np.array([recurrence.step_months(x) for x in script.PAY_INT])[iv]
+
+    today = np.datetime64(anchor, "D")
+    start = today + rng.integers(-POOL_BACK, POOL_AHEAD, n)
+    no_end = rng.random(n) >= END_SHARE
+    end = start + 365
+
+    # next occurrence on or after the anchor (recurrence.next_occurrence)
+    month = start.astype("datetime64[M]")
+    day = (start - month.astype("datetime64[D]")).astype(int)
+    periodic = step > 0
+    k = np.maximum((today.astype("datetime64[M]") - month).astype(int), 0) // np.maximum(step, 1)
+    due = _add_months(month, day, k * step)
+    k += periodic & (due < today)
+    due = np.where(periodic, _add_months(month, day, k * step), start)
+    no_due = (~periodic & (start < today)) | (~no_end & (due > end))
+
+    return [
+        types[t].tolist(), _sql_dates(start), _sql_dates(end, no_end), amount.tolist(),
+        intervals[iv].tolist(), ["active"] * n, [NOTES] * n, _sql_dates(due, no_due),
+        np.where(periodic, amount / np.maximum(step, 1), 0.0).tolist(),
+    ]
+
+
+def contract_chunks(n: int, first_id: int, user_ids: list, anchor: date, seed: int,
+                    owner_share: float | None = None, chunk: int = TXN_ROWS):
+    """
+    Yield lists of (id, user_id, name, *TEMPLATE_COLS) tuples, at most
+    *chunk* long.  Owners are drawn at random (user_ids[0] gets
+    *owner_share* if given) and every chunk is sorted by owner before the
+    ids are handed out, so the user_id indexes are filled in runs instead
+    of at random.
+    """
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    uids = np.asarray(user_ids)
+    cid = first_id
+    for lo in range(0, n, chunk):
+        size = min(chunk, n - lo)
+        owners = rng.integers(0, len(uids), size)
+        if owner_share is not None:
+            owners[rng.random(size) < owner_share] = 0
+        owners.sort()
+        ids = range(cid, cid + size)
+        yield list(zip(ids, uids[owners].tolist(), [f"Demo #{i}" for i in ids],
+                       *contract_columns(size, rng, anchor)))
+        cid += size
+
+
+def _next_id(conn, model) -> int:
+    from sqlalchemy import func, select
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def seed_users(engine, n: int, prefix: str = "seed") -> list:
+    from sqlalchemy import insert
+    from app import models
+    from app.routes.users import _hash
+
+    hashed = _hash(PASSWORD)                           # bcrypt once, not per user
+    with engine.begin() as conn:
+        first = _next_id(conn, models.User)
+        rows = [{"id": first + i, "email": f"{prefix}{first + i}@example.com",
+                 "hashed_password": hashed} for i in range(n)]
+        conn.execute(insert(models.User), rows)
+    return [r["id"] for r in rows]
+
+
+def seed_contracts(engine, n: int, user_ids: list, seed: int, anchor: date,
+                   owner_share: float | None = None, txn: int = TXN_ROWS,
+                   progress: bool = True) -> range:
+    """
+    Insert *n* contracts; returns their id range.  Into an empty table the
+    rows go in without secondary indexes, which are rebuilt (sorted) at
+    the end – much cheaper than updating six B-trees row by row.
+    """
+    from app import models
+
+    table = models.Contract.__table__
+    cols = ("id", "user_id", "name") + TEMPLATE_COLS
+    sql = (f"INSERT INTO {table.name} ({', '.join(cols)}) "
+           f"VALUES ({', '.join('?' * len(cols))})")
+    t0, done = time.perf_counter(), 0
+    with engine.connect() as conn:
+        first = _next_id(conn, models.Contract)
+        indexes = sorted(table.indexes, key=lambda ix: ix.name) if first == 1 else []
+        for ix in indexes:
+            ix.drop(conn)
+        conn.commit()
+        conn.exec_driver_sql(f"PRAGMA cache_size = -{CACHE_KB}")
+        conn.exec_driver_sql("PRAGMA synchronous = OFF")           # not inside a transaction
+        try:
+            for rows in contract_chunks(n, first, user_ids, anchor, seed, owner_share, txn):
+                for lo in range(0, len(rows), BATCH_ROWS):
+                    conn.exec_driver_sql(sql, rows[lo:lo + BATCH_ROWS])
+                conn.commit()                                       # one transaction per chunk
+                done += len(rows)
+                if progress:
+                    dt = time.perf_counter() - t0
+                    print(f"   contracts {done:>11,}/{n:,}  {done / dt:>10,.0f} rows/s")
+        finally:
+            conn.rollback()
+            for ix in indexes:
+                ix.create(conn)
+            conn.commit()
+            if progress and indexes:
+                dt = time.perf_counter() - t0
+                print(f"   + {len(indexes)} indexes  {done / dt:>24,.0f} rows/s overall")
+            conn.exec_driver_sql("PRAGMA synchronous = FULL")
+            conn.exec_driver_sql("PRAGMA cache_size = -2000")
+    return range(first, first + n)
+
+
+def seed_files(engine, n: int, contract_ids: range, seed: int) -> None:
+    from sqlalchemy import insert
+    from app import models
+    from app.config import UPLOAD_DIR
+    from app.utils import crypto_utils
+
+    rnd = random.Random(seed + 2)
+    rows = []
+    for _ in range(n):
+        uid = f"{uuid.UUID(int=rnd.getrandbits(128), version=4)}.txt"
+        dest = UPLOAD_DIR / uid
+        with dest.open("wb") as out:
+            crypto_utils.encrypt_file(io.BytesIO(FILE_BODY), out)
+        rows.append({
+            "contract_id":       contract_ids[int(rnd.random() * len(contract_ids))],
+            "file_path":         f"/files/{uid}",
+            "original_filename": "demo.txt",
+            "size_bytes":        dest.stat().st_size,
+        })
+    with engine.begin() as conn:
+        conn.execute(insert(models.ContractFile), rows)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=1_000)
+    ap.add_argument("--contracts", type=int, default=1_000_000)
+    ap.add_argument("--files", type=int, default=0, help="encrypted dummy attachments")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--anchor", type=date.fromisoformat, default=date.today(),
+                    help="'today' for the generated dates (fix it for reproducible data)")
+    ap.add_argument("--txn", type=int, default=TXN_ROWS, help="rows per transaction")
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.database import Base, engine, upgrade_schema
+    from app.utils import stats
+
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+
+    t0 = time.perf_counter()
+    users = seed_users(engine, max(args.users, 1))
+    print(f"→  {len(users):,} users (password '{PASSWORD}')")
+    ids = seed_contracts(engine, args.contracts, users, args.seed, args.anchor, txn=args.txn)
+    if args.files and args.contracts:
+        seed_files(engine, args.files, ids, args.seed)
+        print(f"→  {args.files:,} encrypted files")
+    stats.reconcile()
+    print(f"✓  done in {time.perf_counter() - t0:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
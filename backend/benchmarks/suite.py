@@ -0,0 +1,322 @@
+# backend/benchmarks/suite.py
+"""
+In-process benchmark suite for the backend hot paths.
+
+    python -m benchmarks.suite run [--sizes 1000,10000,100000] [--users 50]
+                                   [--repeat 5] [--out bench.json]
+    python -m benchmarks.suite compare baseline.json bench.json [--threshold 0.25]
+
+``run`` works in a throw-away directory (own database.db, encryption key,
+logs and uploads via ENCRYPTION_KEY_PATH / LOG_DIR / UPLOAD_DIR), seeds it via benchmarks.seed with *size* contracts spread over
+``--users`` users – the benchmark user owns ``--share`` of them – and times:
+
+  • routes through FastAPI's TestClient (list, search, sort, summary,
+    forecast, single contract, CSV export)
+  • export_contracts_pdf, schedule_all_reminders (up to 1000 of the user's
+    contracts; from scratch and again with nothing changed) and
+    stats.reconcile called directly
+  • crypto_utils.encrypt_file / decrypt_file and logs._tail (size independent)
+
+Before timing, ``run`` checks that create / bulk create / account purge
+keep the system_stats counters equal to a fresh ``stats.reconcile()``.
+
+Every benchmark is reported as min/median/mean in ms.  ``compare`` matches
+two result files by name and exits with 1 when a median got slower than
+``--threshold`` (relative) and ``--min-ms`` (absolute).
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+ANCHOR = date(2025, 1, 1)          # fixed "today" for the seeded data → comparable runs
+
+
+# ───────── Timing ────────────────────────────────────────────────
+def measure(fn, repeat: int) -> dict:
+    fn()                                                    # warm-up
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - t0) * 1000)
+    return {
+        "runs":      repeat,
+        "min_ms":    round(min(runs), 3),
+        "median_ms": round(statistics.median(runs), 3),
+        "mean_ms":   round(statistics.fmean(runs), 3),
+    }
+
+
+# ───────── Seeding ───────────────────────────────────────────────
+def seed_db(size: int, n_users: int, share: float, seed: int) -> tuple:
+    """Replace all users/contracts; return (benchmark user email, its contract count)."""
+    from sqlalchemy import delete, func, select
+    from app import models
+    from app.database import engine
+    from app.utils import stats
+    from .seed import seed_contracts, seed_users
+
+    with engine.begin() as conn:
+        conn.execute(delete(models.ContractFile))
+        conn.execute(delete(models.Contract))
+        conn.execute(delete(models.User))
+    users = seed_users(engine, n_users, prefix="bench")
+    seed_contracts(engine, size, users, seed, ANCHOR, owner_share=share, progress=False)
+    with engine.connect() as conn:
+        owned = conn.execute(
+            select(func.count()).where(models.Contract.user_id == users[0])
+        ).scalar_one()
+    stats.reconcile()
+    return f"bench{users[0]}@example.com", owned
+
+
+# ───────── Benchmarks ────────────────────────────────────────────
+def bench_size(client, size: int, args, results: dict) -> None:
+    from starlette.requests import Request
+    from app import models
+    from app.database import SessionLocal
+    from app.routes import contracts as C, users as U
+    from app.utils.email_utils import schedule_all_reminders, remove_reminders
+
+    t0 = time.perf_counter()
+    email, owned = seed_db(size, args.users, args.share, args.seed)
+    print(f"→  {size:,} contracts seeded in {time.perf_counter() - t0:.1f} s "
+          f"({owned:,} owned by the benchmark user)")
+
+    h = {"Authorization": "Bearer " + U._create_token({"sub": email})}
+    some_id = client.get("/contracts/", params={"limit": 1}, headers=h).json()["items"][0]["id"]
+
+    def get(path, **params):
+        def call():
+            r = client.get(path, params=params, headers=h)
+            assert r.status_code == 200, (path, r.status_code, r.text[:200])
+            r.content
+        return call
+
+    routes = {
+        "list":            get("/contracts/", limit=20),
+        "list_page_50":    get("/contracts/", limit=20, skip=1000),
+        "search":          get("/contracts/", q="Demo #1", limit=20),
+        "filter_type":     get("/contracts/", type="insurance", status="active", limit=20),
+        "sort_amount":     get("/contracts/", sort_by="amount", sort_dir="asc", limit=20),
+        "sort_next_due":   get("/contracts/", sort_by="next_due_date", sort_dir="asc", limit=20),
+        "summary":         get("/contracts/summary"),
+        "forecast":        get("/contracts/forecast"),
+        "get_one":         get(f"/contracts/{some_id}"),
+        "export_csv":      get("/contracts/export/csv"),
+    }
+    for name, fn in routes.items():
+        record(results, f"route.{name}[{size}]", measure(fn, args.repeat))
+
+    db = SessionLocal()
+    try:
+        user = db.query(models.User).filter_by(email=email).one()
+        req = Request({"type": "http", "method": "GET", "path": "/contracts/export/pdf",
+                       "query_string": b"", "headers": []})
+        record(results, f"export_pdf[{size}]", measure(
+            lambda: C.export_contracts_pdf(request=req, db=db, current_user=user),
+            max(1, args.repeat // 5)))
+
+        contracts = db.query(models.Contract).filter_by(user_id=user.id).limit(1000).all()
+        scheduler = client.app.state.scheduler
+
+        ids = [c.id for c in contracts]
+
+        def schedule():
+            remove_reminders(ids, scheduler)
+            for c in contracts:
+                schedule_all_reminders(c, scheduler)
+
+        def reschedule_unchanged():
+            for c in contracts:
+                schedule_all_reminders(c, scheduler)
+        record(results, f"schedule_all_reminders[{size}]",
+               measure(schedule, max(1, args.repeat // 5)))
+        record(results, f"reschedule_unchanged[{size}]",
+               measure(reschedule_unchanged, max(1, args.repeat // 5)))
+        remove_reminders(ids, scheduler)
+    finally:
+        db.close()
+
+    from app.utils import stats
+    record(results, f"stats.reconcile[{size}]", measure(stats.reconcile, max(1, args.repeat // 5)))
+
+
+def check_counters(client) -> None:
+    """Write paths must keep system_stats equal to what stats.reconcile() computes."""
+    from sqlalchemy import select
+    from app.database import SessionLocal, engine
+    from app.models import SystemStat
+    from app.routes import users as U
+    from app.utils import stats
+    from .seed import seed_users
+
+    def counters() -> dict:
+        with SessionLocal() as db:
+            return {k: v for k, v in db.execute(select(SystemStat.key, SystemStat.value))
+                    if v and not k.startswith(("mails.", "reminders.", "reconciled_at"))}
+
+    uid = seed_users(engine, 1, prefix="counters")[0]
+    stats.reconcile()                                       # seeding bypasses the counters
+    h = {"Authorization": "Bearer " + U._create_token({"sub": f"counters{uid}@example.com"})}
+    row = {"name": "Counter check", "contract_type": "rent", "start_date": "2025-01-01T00:00:00",
+           "amount": 10, "payment_interval": "monthly"}
+    steps = [
+        ("create", lambda: client.post("/contracts/", json=row, headers=h)),
+        ("create status=null", lambda: client.post("/contracts/", json={**row, "status": None}, headers=h)),
+        ("bulk create", lambda: client.post("/contracts/bulk", headers=h,
+                                            json=[{**row, "status": None}, {**row, "status": "cancelled"}])),
+        ("purge", lambda: client.delete("/users/me", headers=h)),
+    ]
+    for name, call in steps:
+        r = call()
+        assert r.status_code < 300, (name, r.status_code, r.text[:200])
+        live = counters()
+        stats.reconcile()
+        if live != counters():
+            sys.exit(f"✗  counters drifted after {name}: {live} != {counters()}")
+    print(f"✓  counters match stats.reconcile() after {', '.join(n for n, _ in steps)}")
+
+
+def bench_static(args, results: dict) -> None:
+    from pathlib import Path
+    from app.routes.logs import _tail
+    from app.utils import crypto_utils
+
+    for mb in (1, 10):
+        plain = os.urandom(mb * 1024 * 1024)
+        enc = io.BytesIO()
+        crypto_utils.encrypt_file(io.BytesIO(plain), enc)
+        cipher = enc.getvalue()
+        record(results, f"crypto.encrypt[{mb}MB]", measure(
+            lambda: crypto_utils.encrypt_file(io.BytesIO(plain), io.BytesIO()), args.repeat))
+        record(results, f"crypto.decrypt[{mb}MB]", measure(
+            lambda: crypto_utils.decrypt_file(io.BytesIO(cipher), io.BytesIO()), args.repeat))
+
+    log = Path("bench.log")
+    line = "2025-01-01 12:00:00,000 [INFO] app.bench: " + "x" * 80 + "\n"
+    with log.open("w") as f:
+        for _ in range(50):
+            f.write(line * 10_000)                              # ~6 MB per chunk
+    for n in (500, 5000):
+        record(results, f"logs._tail[{n}]", measure(lambda: _tail(log, n), args.repeat))
+
+
+def record(results: dict, name: str, res: dict) -> None:
+    results[name] = res
+    print(f"   {name:<44}{res['median_ms']:>11.2f} ms  (min {res['min_ms']:.2f})")
+
+
+def run(args) -> None:
+    out = os.path.abspath(args.out)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    workdir = tempfile.mkdtemp(prefix="planpago-bench-")
+    os.chdir(workdir)                                           # database.db is cwd-relative
+    # key, logs and uploads default to the source tree – keep them in the work dir too
+    os.environ["ENCRYPTION_KEY_PATH"] = os.path.join(workdir, "encryption.key")
+    os.environ["LOG_DIR"] = os.path.join(workdir, "logs")
+    os.environ["UPLOAD_DIR"] = os.path.join(workdir, "uploaded_files")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("PAGE_CACHE_BACKEND", "off")         # time the work, not cache hits
+
+    from fastapi.testclient import TestClient
+    from app import main
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)       # one INFO line per request
+
+    results: dict = {}
+    with TestClient(main.app) as client:
+        client.app.state.scheduler.pause()                      # no background jobs while timing
+        check_counters(client)
+        print("→  crypto / log tail")
+        bench_static(args, results)
+        for size in args.sizes:
+            bench_size(client, size, args, results)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python":     platform.python_version(),
+            "platform":   platform.platform(),
+            "sizes":      args.sizes,
+            "users":      args.users,
+            "share":      args.share,
+            "repeat":     args.repeat,
+        },
+        "results": results,
+    }
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.keep:
+        print(f"   work dir kept: {workdir}")
+    else:
+        os.chdir(os.path.dirname(out))
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(f"✓  {len(results)} benchmarks → {out}")
+
+
+# ───────── Compare ───────────────────────────────────────────────
+def compare(args) -> int:
+    with open(args.baseline) as f:
+        base = json.load(f)["results"]
+    with open(args.current) as f:
+        cur = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'benchmark':<46}{'baseline':>11}{'current':>11}{'change':>9}")
+    for name in sorted(base.keys() | cur.keys()):
+        if name not in base or name not in cur:
+            print(f"{name:<46}{'–' if name not in base else base[name]['median_ms']:>11}"
+                  f"{'–' if name not in cur else cur[name]['median_ms']:>11}{'new' if name not in base else 'gone':>9}")
+            continue
+        b, c = base[name]["median_ms"], cur[name]["median_ms"]
+        change = (c - b) / b if b else 0.0
+        slower = change > args.threshold and c - b > args.min_ms
+        regressions += slower
+        flag = "  ⚠︎ REGRESSION" if slower else ""
+        print(f"{name:<46}{b:>11.2f}{c:>11.2f}{change:>+8.0%}{flag}")
+    print(f"\n{regressions} regression(s) (threshold {args.threshold:.0%}, min {args.min_ms} ms)")
+    return 1 if regressions else 0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("run")
+    r.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")],
+                   default=[1_000, 10_000, 100_000])
+    r.add_argument("--users", type=int, default=50)
+    r.add_argument("--share", type=float, default=0.1,
+                   help="fraction of the contracts owned by the benchmark user")
+    r.add_argument("--repeat", type=int, default=5)
+    r.add_argument("--seed", type=int, default=1)
+    r.add_argument("--out", default="bench.json")
+    r.add_argument("--keep", action="store_true", help="keep the temporary work directory")
+
+    c = sub.add_parser("compare")
+    c.add_argument("baseline")
+    c.add_argument("current")
+    c.add_argument("--threshold", type=float, default=0.25, help="relative slow-down to flag")
+    c.add_argument("--min-ms", type=float, default=1.0, help="ignore smaller absolute changes")
+
+    args = ap.parse_args()
+    if args.cmd == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,18 @@ import {
 import ConfirmModal from "../components/ConfirmModal";
 import Notification from "../components/Notification";
 import { authCookies } from "../utils/cookieUtils";
+import { openEventStream } from "../utils/eventStream";
 
 const API = API_BASE;
+const USERS_PAGE = 100;
+const RECIPIENTS_SHOWN = 50;   // search results in the individual-email selector
 
 export default function AdminPanel() {
   /* ─────────────── state ─────────────────────────────── */
   const [tab, setTab] = useState("users");
   const [users, setUsers] = useState([]);
+  const [usersCursor, setUsersCursor] = useState(null);   // next_cursor of the last page
+  const [usersTotal, setUsersTotal] = useState(0);
   const [mailRaw, setMailRaw] = useState("");
   const [health, setHealth] = useState(null);
   const [busy, setBusy] = useState(false);
@@ -41,6 +46,8 @@ export default function AdminPanel() {
   const [individualBody, setIndividualBody] = useState("");
   const [individualFiles, setIndividualFiles] = useState([]);
   const [selectedUserId, setSelectedUserId] = useState("");
+  const [recipientQuery, setRecipientQuery] = useState("");
+  const [recipients, setRecipients] = useState([]);        // server-side search results
 
   const [uptime, setUptime] = useState("");
   const [buildInfo, setBuildInfo] = useState("");
@@ -69,20 +76,49 @@ export default function AdminPanel() {
     return r.text();
   };
 
-  /* ─────────────── load users (once) ──────────────────── */
+  /* ─────────────── load users (page by page) ─────────── */
+  const loadUsers = async (cursor = null) => {
+    try {
+      setBusy(true);
+      const qs = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+      const page = await fetchJSON(`${API}/users/admin/users?limit=${USERS_PAGE}${qs}`);
+      if (!page) return;
+      setUsers((u) => (cursor ? [...u, ...page.items] : page.items));
+      if (page.total != null) setUsersTotal(page.total);
+      setUsersCursor(page.next_cursor);
+    } catch (e) {
+      setNotification({ message: e.message, type: "error" });
+    } finally {
+      setBusy(false);
+    }
+  };
+
   useEffect(() => {
-    (async () => {
+    loadUsers();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  /* ─────────────── recipient search (individual email) ─ */
+  useEffect(() => {
+    if (tab !== "individual") return;
+    const t = setTimeout(async () => {
       try {
-        setBusy(true);
-        setUsers(await fetchJSON(`${API}/users/admin/users`));
+        const q = recipientQuery.trim();
+        const page = await fetchJSON(
+          `${API}/users/admin/users?limit=${RECIPIENTS_SHOWN}&sort_by=email` +
+          (q ? `&q=${encodeURIComponent(q)}` : "")
+        );
+        if (!page) return;
+        setRecipients(page.items);
+        // the select must not keep a user that is no longer listed
+        setSelectedUserId((id) => (page.items.some((u) => String(u.id) === String(id)) ? id : ""));
       } catch (e) {
         setNotification({ message: e.message, type: "error" });
-      } finally {
-        setBusy(false);
       }
-    })();
+    }, 300);
+    return () => clearTimeout(t);
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
+  }, [tab, recipientQuery]);
 
   /* ─────────────── user deletion ─────────────────────── */
   const reallyDeleteUser = async (id) => {
@@ -93,6 +129,7 @@ export default function AdminPanel() {
         headers: authHeader,
       });
       setUsers((u) => u.filter((x) => x.id !== id));
+      setUsersTotal((n) => Math.max(0, n - 1));
       setNotification({ message: "User deleted successfully.", type: "success" });
     } catch (e) {
       setNotification({ message: e.message, type: "error" });
@@ -235,6 +272,7 @@ export default function AdminPanel() {
       if (!response.ok) throw new Error(await response.text());
       setNotification({ message: "Email sent successfully.", type: "success" });
       setIndividualSubj(""); setIndividualBody(""); setIndividualFiles([]); setSelectedUserId("");
+      setRecipientQuery("");
     } catch (e) {
       setNotification({ message: e.message, type: "error" });
     } finally {
@@ -471,8 +509,22 @@ export default function AdminPanel() {
                                         onClick={async () => {
                                           setBusy(true);
                                           setImpersonateWait({ open: true, user: u, requestId: null });
+                                          let closeStream = () => {};
                                           try {
-                                            // Step 1: Create impersonation request (triggers email)
+                                            // Step 1: Subscribe to push events first, so the confirmation cannot be missed
+                                            const confirmedIds = new Set();
+                                            let onConfirmed = () => {};
+                                            await new Promise((resolve, reject) => {
+                                              const t = setTimeout(() => reject(new Error("Event stream unavailable")), 10000);
+                                              closeStream = openEventStream({
+                                                open: () => { clearTimeout(t); resolve(); },
+                                                impersonation: (d) => {
+                                                  if (d.confirmed) confirmedIds.add(d.request_id);
+                                                  onConfirmed();
+                                                },
+                                              }, navigate);
+                                            });
+                                            // Step 2: Create impersonation request (triggers email)
                                             const r = await fetch(`${API}/users/admin/impersonate-request/${u.id}`, {
                                               method: "POST",
                                               headers: authHeader,
@@ -480,17 +532,16 @@ export default function AdminPanel() {
                                             if (!r.ok) throw new Error(await r.text());
                                             const data = await r.json();
                                             setImpersonateWait({ open: true, user: u, requestId: data.request_id });
-                                            // Step 2: Poll for confirmation
-                                            let confirmed = false;
-                                            for (let i = 0; i < 60; ++i) { // up to 60s
-                                              await new Promise(res => setTimeout(res, 2000));
-                                              const poll = await fetch(`${API}/users/admin/impersonate-status/${data.request_id}`, { headers: authHeader });
-                                              if (!poll.ok) throw new Error(await poll.text());
-                                              const pollData = await poll.json();
-                                              if (pollData.confirmed) { confirmed = true; break; }
-                                            }
+                                            // Step 3: Wait for the confirmation event
+                                            const confirmed = await new Promise((resolve) => {
+                                              const t = setTimeout(() => resolve(false), 120000); // up to 2 min
+                                              onConfirmed = () => {
+                                                if (confirmedIds.has(data.request_id)) { clearTimeout(t); resolve(true); }
+                                              };
+                                              onConfirmed();
+                                            });
                                             if (!confirmed) throw new Error("User did not confirm in time.");
-                                            // Step 3: Do the actual impersonation
+                                            // Step 4: Do the actual impersonation
                                             const r2 = await fetch(`${API}/users/admin/impersonate/${u.id}`, {
                                               method: "POST",
                                               headers: authHeader,
@@ -505,6 +556,7 @@ export default function AdminPanel() {
                                             setNotification({ message: e.message, type: "error" });
                                             setImpersonateWait({ open: false, user: null, requestId: null });
                                           } finally {
+                                            closeStream();
                                             setBusy(false);
                                           }
                                         }}
@@ -524,6 +576,18 @@ export default function AdminPanel() {
                         </table>
                       </div>
                     </div>
+                    <div className="flex items-center justify-between text-white/60 text-sm">
+                      <span>{users.length} of {usersTotal} users</span>
+                      {usersCursor && (
+                        <button
+                          onClick={() => loadUsers(usersCursor)}
+                          disabled={busy}
+                          className="btn-primary px-4 py-2 rounded-lg"
+                        >
+                          Load more
+                        </button>
+                      )}
+                    </div>
                   </div>
                 )}
 
@@ -618,6 +682,12 @@ export default function AdminPanel() {
                         {/* User Selection */}
                         <div className="space-y-3">
                           <label className="block text-white/80 font-medium">Select Recipient</label>
+                          <input
+                            className="frosted-input"
+                            placeholder="Search by email…"
+                            value={recipientQuery}
+                            onChange={(e) => setRecipientQuery(e.target.value)}
+                          />
                           <select
                             className="frosted-input"
                             value={selectedUserId}
@@ -625,7 +695,7 @@ export default function AdminPanel() {
                             required
                           >
                             <option value="">Choose a user...</option>
-                            {users.map((user) => (
+                            {recipients.map((user) => (
                               <option key={user.id} value={user.id}>
                                 {user.email} (ID: {user.id})
                               </option>
@@ -942,7 +1012,7 @@ function LatencyCheck({ api }) {
     (async () => {
       const t0 = performance.now();
       try {
-        await fetch(`${api}/users/admin/health`, { cache: "no-store" });
+        await fetch(`${api}/healthz`, { cache: "no-store" });
         const t1 = performance.now();
         if (mounted) setLatency(Math.round(t1 - t0));
       } catch {
@@ -44,6 +44,8 @@ export default function ContractForm() {
   const [busy, setBusy] = useState(false);
   const [dragActive, setDragActive] = useState(false);
   const fileInputRef = useRef(null);
+  // list rows come without notes – only send notes once they were loaded
+  const [notesLoaded, setNotesLoaded] = useState(!isEdit);
 
   /* ───── preload user context & contract ──────────── */
   useEffect(() => {
@@ -53,12 +55,13 @@ export default function ContractForm() {
 
     if (isEdit) {
       if (state?.contract) prefill(state.contract);
-      else fetchContract();
+      if (!state?.contract || !("notes" in state.contract)) fetchContract();
     }
     // eslint-disable-next-line
   }, []);
 
-  const prefill = (c) =>
+  const prefill = (c) => {
+    if ("notes" in c) setNotesLoaded(true);
     setForm(f => ({
       ...f, ...c,
       start_date: c.start_date?.slice(0, 10) || "",
@@ -66,11 +69,13 @@ export default function ContractForm() {
       netto: c.contract_type === "salary" ? c.amount : "",
       brutto: "",
       backendFiles: c.files || [], // <-- Store backend files
+      notes: c.notes ?? f.notes ?? "",
     }));
+  };
 
   const fetchContract = async () => {
     const token = authCookies.getToken();
-    const r = await fetch(`${API}${id}`, {
+    const r = await fetch(`${API}${id}?fields=*`, {   // volle Zeile inkl. notes
       headers: { Authorization: `Bearer ${token}` },
     });
     if (r.ok) prefill(await r.json());
@@ -129,7 +134,7 @@ export default function ContractForm() {
       amount,
       payment_interval: form.payment_interval,
       status: "active",
-      notes: form.notes,
+      ...(notesLoaded ? { notes: form.notes } : {}),
     };
   };
 
@@ -22,6 +22,7 @@ import {
 } from "lucide-react";
 import ConfirmModal from "../components/ConfirmModal";
 import Notification from "../components/Notification";
+import { openEventStream } from "../utils/eventStream";
 import { fetchWithAuth } from "../utils/fetchWithAuth";
 import { authCookies } from "../utils/cookieUtils";
 
@@ -45,11 +46,19 @@ const STATUS_OPTIONS = [
   { label: "Expired", value: "expired" },
 ];
 
+/* Option label with its facet count – only while that filter is unset,
+   otherwise the other options would all read (0) */
+const facetLabel = (label, value, active, buckets) => {
+  if (!value || active || !buckets) return label;
+  return `${label} (${buckets[value]?.count ?? 0})`;
+};
+
 /* ───────── component ────────────────────────────────────────── */
 export default function Dashboard() {
   /* main data & ui state */
   const [contracts, setContracts] = useState([]);
   const [total, setTotal] = useState(0);
+  const [facets, setFacets] = useState(null); // counts/sums for the current filter
   const [page, setPage] = useState(0);
 
   const [query, setQuery] = useState("");
@@ -70,6 +79,7 @@ export default function Dashboard() {
   const [exportOpen, setExportOpen] = useState(false);
   const exportRef = useRef();
   const [filesCache, setFilesCache] = useState({}); // contractId -> files array
+  const [notesCache, setNotesCache] = useState({}); // contractId -> notes (list omits them)
 
   const navigate = useNavigate();
   const API = API_BASE;
@@ -82,13 +92,14 @@ export default function Dashboard() {
     "€";
 
   /* ───── fetch contracts page ───────────────────────────────── */
-  const loadPage = useCallback(async () => {
-    setLd(true);
+  const loadPage = useCallback(async ({ silent = false } = {}) => {
+    if (!silent) setLd(true);
     setErr("");
     try {
       const p = new URLSearchParams({
         skip: page * PAGE_SIZE,
         limit: PAGE_SIZE,
+        facets: "true",
       });
       if (query.trim()) p.append("q", query.trim());
       if (filterType) p.append("type", filterType);
@@ -99,10 +110,12 @@ export default function Dashboard() {
 
       const r = await fetchWithAuth(`${API}/contracts/?${p.toString()}`, { headers: authHeader }, navigate);
       if (!r.ok) throw new Error(await r.text());
-      const { items, total } = await r.json();
+      const { items, total, facets } = await r.json();
 
       setContracts(items);
       setTotal(total);
+      setFacets(facets || null);
+      setNotesCache({});
 
       // Batch-load files for all visible contracts
       const filesPromises = items.map(async (contract) => {
@@ -137,9 +150,36 @@ export default function Dashboard() {
     }
   };
 
+  /* Notes are not part of the list response – load them when a row is expanded */
+  const loadNotesForContract = async (contractId) => {
+    if (contractId in notesCache) return;
+    try {
+      const response = await fetchWithAuth(`${API}/contracts/${contractId}?fields=notes`, {}, navigate);
+      if (response.ok) {
+        const { notes } = await response.json();
+        setNotesCache(cache => ({ ...cache, [contractId]: notes }));
+      }
+    } catch (e) {
+      console.error('Failed to load notes:', e);
+    }
+  };
+
   /* initial + dependents */
   useEffect(() => { loadPage(); }, [loadPage]);
 
+  /* live updates: another tab or device changed contracts/files */
+  const loadPageRef = useRef(loadPage);
+  useEffect(() => { loadPageRef.current = loadPage; }, [loadPage]);
+  useEffect(() => {
+    let timer = null;
+    const reload = () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => loadPageRef.current({ silent: true }), 300);
+    };
+    const close = openEventStream({ changed: reload, resync: reload }, navigate);
+    return () => { clearTimeout(timer); close(); };
+  }, [navigate]);
+
   /* reload on filters/search change */
   useEffect(() => {
     setPage(0);
@@ -306,6 +346,11 @@ export default function Dashboard() {
               <h1 className="text-3xl font-semibold text-white mb-2">Contract Overview</h1>
               <p className="text-white/70 text-lg">
                 {`Total contracts: ${total}`}
+                {facets && total > 0 && (
+                  <span className="text-white/50 text-base">
+                    {` · ${currency}${facets.monthly.toFixed(2)} / month`}
+                  </span>
+                )}
               </p>
             </div>
             <div className="flex flex-row gap-3">
@@ -448,7 +493,9 @@ export default function Dashboard() {
                     onChange={(e) => setFType(e.target.value)}
                   >
                     {TYPE_OPTIONS.map(({ label, value }) => (
-                      <option key={value} value={value}>{label}</option>
+                      <option key={value} value={value}>
+                        {facetLabel(label, value, filterType, facets?.by_type)}
+                      </option>
                     ))}
                   </select>
                 </div>
@@ -460,7 +507,9 @@ export default function Dashboard() {
                     onChange={(e) => setFStat(e.target.value)}
                   >
                     {STATUS_OPTIONS.map(({ label, value }) => (
-                      <option key={value} value={value}>{label}</option>
+                      <option key={value} value={value}>
+                        {facetLabel(label, value, filterStat, facets?.by_status)}
+                      </option>
                     ))}
                   </select>
                 </div>
@@ -551,6 +600,7 @@ export default function Dashboard() {
                         onClick={async () => {
                           if (expandedId !== c.id) {
                             setExpandedId(c.id);
+                            loadNotesForContract(c.id);
                             if (!filesCache[c.id]) await loadFilesForContract(c.id);
                           } else {
                             setExpandedId(null);
@@ -675,7 +725,11 @@ export default function Dashboard() {
                               <div className="p-6 bg-white/5 border-t border-white/10 animate-pop text-white/90">
                                 <div className="font-semibold mb-1 text-left">Notes</div>
                                 <div className="whitespace-pre-line text-white/80 min-h-[1.5em] text-left">
-                                  {c.notes ? c.notes : <span className="italic text-white/40">No notes entered.</span>}
+                                  {!(c.id in notesCache)
+                                    ? <span className="italic text-white/40">Loading…</span>
+                                    : notesCache[c.id]
+                                      ? notesCache[c.id]
+                                      : <span className="italic text-white/40">No notes entered.</span>}
                                 </div>
                               </div>
                             )}
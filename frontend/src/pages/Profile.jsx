@@ -33,6 +33,7 @@ export default function Profile() {
 
   // Settings data
   const [emailReminders, setEmailReminders] = useState(true);
+  const [reminderDigest, setReminderDigest] = useState(false);
   const [country, setCountry] = useState("");
   const [currency, setCurrency] = useState("EUR");
 
@@ -70,6 +71,7 @@ export default function Profile() {
         setUser(userData);
         setEmail(userData.email);
         setEmailReminders(userData.email_reminders_enabled ?? true);
+        setReminderDigest(userData.reminder_digest ?? false);
         setCountry(userData.country || "");
         setCurrency(userData.currency || "EUR");
       } catch (e) {
@@ -219,6 +221,7 @@ export default function Profile() {
         },
         body: JSON.stringify({
           email_reminders_enabled: emailReminders,
+          reminder_digest: reminderDigest,
           country: country,
           currency: currency
         })
@@ -524,6 +527,24 @@ export default function Profile() {
                   </label>
                 </div>
 
+                <div className={`flex items-center gap-4 p-4 bg-white/5 rounded-lg ${emailReminders ? "" : "opacity-50"}`}>
+                  <Mail size={20} className="text-white/70" />
+                  <div className="flex-1">
+                    <label className="block text-white/80 font-medium">Daily Digest</label>
+                    <p className="text-white/60 text-sm">Bundle all reminders of a day into one email</p>
+                  </div>
+                  <label className="relative inline-flex items-center cursor-pointer">
+                    <input
+                      type="checkbox"
+                      className="sr-only peer"
+                      checked={reminderDigest}
+                      disabled={!emailReminders}
+                      onChange={(e) => setReminderDigest(e.target.checked)}
+                    />
+                    <div className="w-11 h-6 bg-gray-200 peer-focus:outline-none peer-focus:ring-4 peer-focus:ring-blue-300 dark:peer-focus:ring-blue-800 rounded-full peer dark:bg-gray-700 peer-checked:after:translate-x-full peer-checked:after:border-white after:content-[''] after:absolute after:top-[2px] after:left-[2px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-5 after:w-5 after:transition-all dark:border-gray-600 peer-checked:bg-blue-600"></div>
+                  </label>
+                </div>
+
                 <div className="flex gap-4">
                   <div className="flex-1">
                     <label className="block text-white/80 mb-2 flex items-center gap-2">
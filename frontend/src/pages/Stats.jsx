@@ -14,7 +14,6 @@ import { TrendingUp, TrendingDown, DollarSign, Calendar } from "lucide-react";
 import Card from "../components/Card";
 import KPI from "../components/KPI";
 import Notification from "../components/Notification";
-import { upcomingPayments } from "../utils/statsHelpers";
 import { authCookies } from "../utils/cookieUtils";
 
 /* Color map & Glass tooltip style */
@@ -27,6 +26,9 @@ const TYPE_COLORS = {
   other: "#6B7280",
 };
 
+const UPCOMING_MAX = 50;    // summary returns the next due payment per contract
+const UPCOMING_DAYS = 30;
+
 const glassTooltipStyle = {
   background: "rgba(255,255,255,.08)",
   backdropFilter: "blur(10px) saturate(180%)",
@@ -43,7 +45,7 @@ export default function Stats() {
     []
   );
 
-  const [contracts, setContracts] = useState([]);
+  const [summary, setSummary] = useState(null);
   const [err, setErr] = useState("");
   const [loading, setLd] = useState(true);
   const [msg, setMsg] = useState("");
@@ -55,17 +57,14 @@ export default function Stats() {
       `currency_${localStorage.getItem("currentEmail")}`
     ) || "€";
 
-  /* Load contracts (limit=100) */
+  /* Load the server-side summary (totals, per-type buckets, next payments) */
   useEffect(() => {
     (async () => {
       try {
         setLd(true);
-        const r = await fetch(`${API}/contracts/?limit=100`, {
-          headers: authHeader,
-        });
+        const r = await fetch(`${API}/contracts/summary?upcoming=${UPCOMING_MAX}`, { headers: authHeader });
         if (!r.ok) throw new Error(await r.text());
-        const raw = await r.json();
-        setContracts(Array.isArray(raw) ? raw : raw.items);
+        setSummary(await r.json());
       } catch (e) {
         setErr(e.message || "Unknown error");
       } finally {
@@ -74,40 +73,25 @@ export default function Stats() {
     })();
   }, [API, authHeader]);
 
-  /* KPI calculation */
+  /* KPI calculation – server-side totals */
   const kpi = useMemo(() => {
-    const activeContracts = contracts.filter(c => c.status !== "expired" && c.status !== "cancelled");
-    const income = activeContracts
-      .filter((c) => c.contract_type === "salary")
-      .reduce((s, c) => {
-        const yearly = c.payment_interval === "yearly";
-        return s + Number(c.amount) / (yearly ? 12 : 1);
-      }, 0);
-    const expenses = activeContracts
-      .filter((c) => c.contract_type !== "salary")
-      .reduce((s, c) => {
-        const yearly = c.payment_interval === "yearly";
-        return s + Number(c.amount) / (yearly ? 12 : 1);
-      }, 0);
+    const income = summary?.income || 0;
+    const expenses = summary?.expense || 0;
     const available = income - expenses;
     const savingRate = income ? (available / income) * 100 : 0;
     return { income, expenses, available, savingRate };
-  }, [contracts]);
+  }, [summary]);
 
   /* Expense donut (monthly) */
   const expenseData = useMemo(() => {
     const map = Object.fromEntries(
       Object.keys(TYPE_COLORS).filter(k => k !== 'salary').map((k) => [k, 0])
     );
-    contracts
-      .filter((c) => c.contract_type !== "salary" && c.status !== "expired" && c.status !== "cancelled")
-      .forEach((c) => {
-        const yearly = c.payment_interval === "yearly";
-        const v = Number(c.amount) / (yearly ? 12 : 1);
-        const key = TYPE_COLORS[c.contract_type]
-          ? c.contract_type
-          : "other";
-        map[key] += v;
+    Object.entries(summary?.by_type || {})
+      .filter(([type]) => type !== "salary")
+      .forEach(([type, bucket]) => {
+        const key = TYPE_COLORS[type] ? type : "other";
+        map[key] += bucket.monthly;
       });
     return Object.entries(map)
       .filter(([, v]) => v > 0)
@@ -115,27 +99,31 @@ export default function Stats() {
         name: name.charAt(0).toUpperCase() + name.slice(1),
         value
       }));
-  }, [contracts]);
+  }, [summary]);
   const expenseTotal = expenseData.reduce((s, e) => s + e.value, 0);
 
   /* Income donut (monthly) */
-  const incomeData = useMemo(() => {
-    const map = {};
-    contracts
-      .filter((c) => c.contract_type === "salary" && c.status !== "expired" && c.status !== "cancelled")
-      .forEach((c) => {
-        const yearly = c.payment_interval === "yearly";
-        const v = Number(c.amount) / (yearly ? 12 : 1);
-        map[c.name] = (map[c.name] || 0) + v;
-      });
-    return Object.entries(map)
+  const incomeData = useMemo(() =>
+    Object.entries(summary?.income_by_name || {})
       .filter(([, v]) => v > 0)
-      .map(([name, value]) => ({ name, value }));
-  }, [contracts]);
+      .map(([name, value]) => ({ name, value })),
+    [summary]
+  );
   const incomeTotal = incomeData.reduce((s, e) => s + e.value, 0);
 
-  /* Upcoming payments */
-  const upcoming = useMemo(() => upcomingPayments(contracts), [contracts]);
+  /* Upcoming payments (next 30 days) */
+  const upcoming = useMemo(() => {
+    const until = Date.now() + UPCOMING_DAYS * 24 * 60 * 60 * 1000;
+    return (summary?.upcoming || [])
+      .map((p) => ({
+        id: p.id,
+        name: p.name,
+        amount: Number(p.amount),
+        date: new Date(p.due_date),
+        type: p.contract_type,
+      }))
+      .filter((p) => p.date.getTime() <= until);
+  }, [summary]);
   const upcomingExpenses = useMemo(() =>
     upcoming.reduce((s, x) => s + (x.type !== 'salary' ? x.amount : 0), 0),
     [upcoming]
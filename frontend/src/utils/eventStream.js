@@ -0,0 +1,60 @@
+// eventStream.js
+import { API_BASE } from '../config';
+import { fetchWithAuth } from './fetchWithAuth';
+
+const RECONNECT_MS = 5000;
+
+/**
+ * Subscribe to the per-user server-sent events (/events/stream).
+ * EventSource reconnects by itself and sends Last-Event-ID; once the ticket
+ * has expired the server answers 401, the source closes and a fresh ticket
+ * is fetched, resuming after the last event seen.
+ * @param {Object<string, Function>} handlers - event type ("changed", "resync",
+ *   "impersonation", or "open") → callback(data)
+ * @param {Function} navigate - Navigation function for redirects
+ * @returns {Function} - closes the stream
+ */
+export function openEventStream(handlers, navigate = null) {
+  let source = null;
+  let lastId = null;
+  let closed = false;
+  let timer = null;
+
+  const reconnect = () => {
+    source?.close();
+    if (!closed) timer = setTimeout(connect, RECONNECT_MS);
+  };
+
+  async function connect() {
+    try {
+      const r = await fetchWithAuth(`${API_BASE}/events/ticket`, { method: 'POST' }, navigate);
+      if (!r.ok) throw new Error(await r.text());
+      const { ticket } = await r.json();
+      if (closed) return;
+
+      const p = new URLSearchParams({ ticket });
+      if (lastId) p.append('last_event_id', lastId);
+      source = new EventSource(`${API_BASE}/events/stream?${p.toString()}`);
+      Object.entries(handlers).forEach(([type, fn]) => {
+        source.addEventListener(type, (e) => {
+          if (e.lastEventId) lastId = e.lastEventId;
+          fn(e.data ? JSON.parse(e.data) : {});
+        });
+      });
+      source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) reconnect();
+      };
+    } catch {
+      reconnect();
+    }
+  }
+
+  connect();
+  return () => {
+    closed = true;
+    clearTimeout(timer);
+    source?.close();
+  };
+}
+
+export default openEventStream;
@@ -8,16 +8,32 @@ Erstellt auf Knopfdruck mehrere Demo-Verträge (Default: 25) über die REST-API.
 • API_BASE_URL : https://planpago.buccilab.com/api (ENV oder CLI)
 • --count      : Anzahl der Einträge (Default 25)
 • --insecure   : SSL-Prüfung abschalten (Self-signed Certs)
+• --bulk       : POST /contracts/bulk in Paketen statt einzelner Requests
+• --batch      : Paketgröße im Bulk-Modus (Default 500, max. 1000)
+• --load       : Lasttest statt Anlegen (httpx.AsyncClient, siehe unten)
+    --concurrency  parallele Clients            (Default 10)
+    --duration     Laufzeit in Sekunden         (Default 30)
+    --mix          Szenario-Gewichte, z.B. "list=40,get=20,create=5"
+                   (list, search, get, create, update, upload, preview, export)
+    --seed         Verträge, die vorab für get/update/preview angelegt werden
+    --json         Report zusätzlich als JSON in diese Datei schreiben
 
 Beispiel:
   export TOKEN="$(pbpaste)"                           # JWT aus Zwischenablage
   python3 bulk_create_contracts.py \
           --api https://planpago.buccilab.com/api \
           --count 25
+
+  python3 bulk_create_contracts.py --count 10000 --bulk
+
+  # gegen lokalen uvicorn (uvicorn app.main:app --port 8000)
+  python3 bulk_create_contracts.py --api http://localhost:8000 --load \
+          --concurrency 20 --duration 60 --json load.json
 """
 
-import os, random, datetime, argparse, sys, requests
-from typing import Dict
+import os, random, datetime, argparse, sys, asyncio, json, time
+from collections import defaultdict
+from typing import Dict, List
 
 TYPES   = ["rent", "insurance", "streaming", "salary", "leasing", "other"]
 PAY_INT = ["monthly", "yearly", "one-time"]
@@ -49,6 +65,201 @@ def fake_contract(idx: int) -> Dict:
         "notes"           : "generated via bulk script",
     }
 
+# ─────────────────────────────────────────────────────────────────────────────
+def create_bulk(url: str, headers: Dict, verify: bool, count: int, batch: int) -> None:
+    """Send the demo contracts in packets to POST /contracts/bulk."""
+    import requests
+    bulk_url = url.rstrip("/") + "/bulk"
+    print(f"→  POST {bulk_url}  (count={count}, batch={batch})")
+    created = failed = 0
+    for lo in range(0, count, batch):
+        payload = [fake_contract(i) for i in range(lo, min(lo + batch, count))]
+        resp    = requests.post(bulk_url, json=payload, headers=headers, verify=verify, timeout=60)
+        if resp.status_code != 201:
+            print("   ⚠︎  Fehler:", resp.status_code, resp.text)
+            break
+        data     = resp.json()
+        created += data["succeeded"]
+        failed  += data["failed"]
+        for r in data["results"]:
+            if not r["ok"]:
+                print(f"   ⚠︎  #{lo + r['index'] + 1}: {r['error']}")
+        print(f"   ✓  {created}/{count}")
+    print(f"Fertig: {created} angelegt, {failed} fehlerhaft")
+
+# ───────── Load test ──────────────────────────────────────────────────────────
+DEFAULT_MIX = "list=35,search=15,get=20,create=8,update=8,upload=4,preview=6,export=4"
+UPLOAD_BODY = b"PlanPago load test attachment\n" * 64                # ~2 KB
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            sys.exit(f"❌  Unbekanntes Szenario '{name}' (erlaubt: {', '.join(SCENARIOS)})")
+        mix[name] = int(weight or 1)
+    return {k: w for k, w in mix.items() if w > 0}
+
+
+def percentile(sorted_ms: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_ms:
+        return 0.0
+    k = max(0, min(len(sorted_ms) - 1, round(p / 100 * len(sorted_ms) + 0.5) - 1))
+    return sorted_ms[k]
+
+
+class LoadState:
+    """Shared ids and per-scenario results of one load run."""
+
+    def __init__(self):
+        self.ids: List[int]      = []           # contracts usable for get/update
+        self.created: List[int]  = []           # created during the run → cleanup
+        self.files: List[tuple]  = []           # (contract_id, file_id) for preview
+        self.latency             = defaultdict(list)    # scenario → [ms]
+        self.errors              = defaultdict(int)     # scenario → count
+        self.status              = defaultdict(lambda: defaultdict(int))
+        self.counter             = 0
+
+
+async def _list(c, st):
+    return await c.get("/contracts/", params={"limit": 20, "sort_by": "next_due_date", "sort_dir": "asc"})
+
+async def _search(c, st):
+    return await c.get("/contracts/", params={"q": random.choice(["Demo", "#1", "load"]), "limit": 20})
+
+async def _get(c, st):
+    return await c.get(f"/contracts/{random.choice(st.ids)}")
+
+async def _create(c, st):
+    st.counter += 1
+    payload = fake_contract(st.counter)
+    payload["name"] = f"Load #{st.counter}"
+    r = await c.post("/contracts/", json=payload)
+    if r.status_code == 201:
+        st.created.append(r.json()["id"])
+    return r
+
+async def _update(c, st):
+    return await c.patch(f"/contracts/{random.choice(st.ids)}",
+                         json={"amount": float(random.randint(10, 1500))})
+
+async def _upload(c, st):
+    cid = random.choice(st.ids)
+    r = await c.post(f"/contracts/{cid}/files",
+                     files=[("files", ("load.txt", UPLOAD_BODY, "text/plain"))])
+    if r.status_code == 201:
+        st.files.append((cid, r.json()[0]["id"]))
+    return r
+
+async def _preview(c, st):
+    cid, fid = random.choice(st.files)
+    return await c.get(f"/contracts/{cid}/files/preview/{fid}")
+
+async def _export(c, st):
+    return await c.get("/contracts/export/csv")
+
+SCENARIOS = {
+    "list": _list, "search": _search, "get": _get, "create": _create,
+    "update": _update, "upload": _upload, "preview": _preview, "export": _export,
+}
+
+
+async def _setup(c, st: LoadState, seed: int) -> None:
+    """Create the contracts (and one attachment) the read scenarios work on."""
+    for i in range(seed):
+        payload = fake_contract(i)
+        payload["name"] = f"Load seed #{i + 1}"
+        r = await c.post("/contracts/", json=payload)
+        r.raise_for_status()
+        st.ids.append(r.json()["id"])
+    st.created.extend(st.ids)
+    r = await _upload(c, st)
+    r.raise_for_status()
+
+
+async def _worker(c, st: LoadState, names, weights, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        name = random.choices(names, weights)[0]
+        t0 = time.perf_counter()
+        try:
+            r = await SCENARIOS[name](c, st)
+            code = r.status_code
+            await r.aread()
+        except Exception as exc:                                  # timeouts, resets …
+            code = type(exc).__name__
+        st.latency[name].append((time.perf_counter() - t0) * 1000)
+        st.status[name][str(code)] += 1
+        if not isinstance(code, int) or code >= 400:
+            st.errors[name] += 1
+
+
+def build_report(st: LoadState, elapsed: float, concurrency: int) -> Dict:
+    def summary(lat: List[float], errors: int) -> Dict:
+        lat = sorted(lat)
+        n = len(lat)
+        return {
+            "requests"  : n,
+            "errors"    : errors,
+            "error_rate": round(errors / n, 4) if n else 0.0,
+            "rps"       : round(n / elapsed, 2) if elapsed else 0.0,
+            "mean_ms"   : round(sum(lat) / n, 2) if n else 0.0,
+            "p50_ms"    : round(percentile(lat, 50), 2),
+            "p95_ms"    : round(percentile(lat, 95), 2),
+            "p99_ms"    : round(percentile(lat, 99), 2),
+            "max_ms"    : round(lat[-1], 2) if n else 0.0,
+        }
+
+    endpoints = {
+        name: {**summary(lat, st.errors[name]), "status": dict(st.status[name])}
+        for name, lat in sorted(st.latency.items())
+    }
+    every = [ms for lat in st.latency.values() for ms in lat]
+    return {
+        "started_at" : datetime.datetime.now().isoformat(timespec="seconds"),
+        "duration_s" : round(elapsed, 2),
+        "concurrency": concurrency,
+        "total"      : summary(every, sum(st.errors.values())),
+        "endpoints"  : endpoints,
+    }
+
+
+def print_report(report: Dict) -> None:
+    head = f"{'endpoint':<10}{'req':>8}{'err%':>8}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(f"\nDauer {report['duration_s']} s, {report['concurrency']} parallele Clients (Zeiten in ms)")
+    print(head)
+    print("─" * len(head))
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for name, r in rows:
+        print(f"{name:<10}{r['requests']:>8}{r['error_rate'] * 100:>7.1f}%{r['rps']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+
+
+async def run_load(api: str, headers: Dict, verify: bool, concurrency: int,
+                   duration: float, mix: Dict[str, int], seed: int) -> Dict:
+    import httpx                                            # nur für --load nötig
+
+    st = LoadState()
+    names, weights = list(mix), list(mix.values())
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {k: v for k, v in headers.items() if k != "Content-Type"}   # multipart-Uploads
+    async with httpx.AsyncClient(base_url=api.rstrip("/"), headers=headers, verify=verify,
+                                 timeout=30, limits=limits) as c:
+        print(f"→  Setup: {seed} Verträge + 1 Anhang")
+        await _setup(c, st, max(seed, 1))
+        print(f"→  Last: {concurrency} Clients × {duration:.0f} s  ({', '.join(f'{k}={v}' for k, v in mix.items())})")
+        t0 = time.perf_counter()
+        deadline = t0 + duration
+        await asyncio.gather(*(_worker(c, st, names, weights, deadline) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+
+        # aufräumen – Dateien werden mit den Verträgen gelöscht
+        for lo in range(0, len(st.created), 1000):
+            await c.request("DELETE", "/contracts/bulk", json={"ids": st.created[lo:lo + 1000]})
+    return build_report(st, elapsed, concurrency)
+
 # ─────────────────────────────────────────────────────────────────────────────
 def main():
     parser = argparse.ArgumentParser()
@@ -57,6 +268,14 @@ def main():
     parser.add_argument("--count",  type=int, default=25, help="how many contracts to create")
     parser.add_argument("--token",  default=os.getenv("TOKEN"), help="JWT token")
     parser.add_argument("--insecure", action="store_true", help="disable TLS verification")
+    parser.add_argument("--bulk",   action="store_true", help="use POST /contracts/bulk")
+    parser.add_argument("--batch",  type=int, default=500, help="items per bulk request (max 1000)")
+    parser.add_argument("--load",   action="store_true", help="run a load test instead of creating contracts")
+    parser.add_argument("--concurrency", type=int, default=10, help="parallel clients in --load mode")
+    parser.add_argument("--duration",    type=float, default=30, help="seconds to run in --load mode")
+    parser.add_argument("--mix",    default=DEFAULT_MIX, help="scenario weights, e.g. list=40,get=20,create=5")
+    parser.add_argument("--seed",   type=int, default=20, help="contracts created up front for --load")
+    parser.add_argument("--json",   help="also write the --load report to this file")
     args = parser.parse_args()
 
     if not args.token:
@@ -66,6 +285,21 @@ def main():
     headers = {"Authorization": f"Bearer {args.token}", "Content-Type": "application/json"}
     verify  = not args.insecure                                   # False = self-signed
 
+    if args.load:
+        report = asyncio.run(run_load(args.api, headers, verify, max(args.concurrency, 1),
+                                      args.duration, parse_mix(args.mix), args.seed))
+        print_report(report)
+        if args.json:
+            with open(args.json, "w") as fh:
+                json.dump(report, fh, indent=2)
+            print(f"Report: {args.json}")
+        return
+
+    if args.bulk:
+        create_bulk(url, headers, verify, args.count, min(args.batch, 1000))
+        return
+
+    import requests                        # lazy: fake_contract is also used by benchmarks.seed
     print(f"→  POST {url}  (count={args.count})")
     for i in range(args.count):
         payload = fake_contract(i)